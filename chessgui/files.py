@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 try:
     from importlib import resources
@@ -5,7 +6,10 @@ except ImportError:
     # Try backported to PY<37 `importlib_resources`.
     import importlib_resources as resources
 
+# Resolved once, instead of traversing the package resources on every lookup
+_ICONS_DIR = resources.files('chessgui').joinpath('icons')
 
+
+@lru_cache(maxsize=None)
 def get_icon(name, file_extension='svg'):
-    path = resources.files('chessgui').joinpath('icons')
-    return Path(path.joinpath(f'{name}.{file_extension}'))
+    return Path(_ICONS_DIR.joinpath(f'{name}.{file_extension}'))
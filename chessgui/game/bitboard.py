@@ -0,0 +1,239 @@
+"""Helpers for bitboards.
+
+A bitboard is an integer representing a set of squares, in which bit 8 * row + col is set if the
+square in the given (zero-based) row and column belongs to the set.
+"""
+
+ALL_SQUARES = (1 << 64) - 1
+# All squares except those in the first and in the last column of the board
+NOT_FIRST_COL = ALL_SQUARES & ~sum(1 << (8 * row) for row in range(8))
+NOT_LAST_COL = ALL_SQUARES & ~sum(1 << (8 * row + 7) for row in range(8))
+
+# All squares of each row of the board, indexed by the row
+ROWS = tuple(0xFF << (8 * row) for row in range(8))
+
+# Zero-based row and column of every square, indexed by 8 * row + col
+SQUARES = tuple(divmod(index, 8) for index in range(64))
+
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+
+def iter_bits(bitboard: int):
+    """
+    Iterate over the squares in a bitboard.
+
+    Args:
+        bitboard (int): The set of squares.
+
+    Yields:
+        index (int): The index 8 * row + col of each square, lowest first.
+    """
+    while bitboard:
+        yield (bitboard & -bitboard).bit_length() - 1
+        bitboard &= bitboard - 1
+
+
+def _leaper_attacks(offsets: tuple[tuple[int, int], ...]) -> tuple[int, ...]:
+    """Bitboards of the squares reachable with a single step by one of the offsets."""
+    attacks = []
+    for row in range(8):
+        for col in range(8):
+            bitboard = 0
+            for row_offset, col_offset in offsets:
+                if 0 <= row + row_offset < 8 and 0 <= col + col_offset < 8:
+                    bitboard |= 1 << (8 * (row + row_offset) + col + col_offset)
+            attacks.append(bitboard)
+    return tuple(attacks)
+
+
+# Squares attacked by a king or knight, indexed by the square 8 * row + col it stands on
+KING_ATTACKS = _leaper_attacks(ROOK_DIRECTIONS + BISHOP_DIRECTIONS)
+KNIGHT_ATTACKS = _leaper_attacks(KNIGHT_OFFSETS)
+# Squares attacked by a pawn, indexed first by whether the pawn is white and then by its square
+PAWN_ATTACKS = (_leaper_attacks(((1, -1), (1, 1))), _leaper_attacks(((-1, -1), (-1, 1))))
+
+
+def pawn_attacks(pawns: int, is_white: bool) -> int:
+    """
+    Squares attacked by a set of pawns.
+
+    Args:
+        pawns (int): Bitboard of the squares of the pawns.
+        is_white (bool): Whether the pawns are white, which move towards row zero.
+
+    Returns:
+        attacks (int): Bitboard of the attacked squares.
+    """
+    if is_white:
+        return ((pawns & NOT_FIRST_COL) >> 9) | ((pawns & NOT_LAST_COL) >> 7)
+    return (((pawns & NOT_FIRST_COL) << 7) | ((pawns & NOT_LAST_COL) << 9)) & ALL_SQUARES
+
+
+def pawn_pushes(pawns: int, empty: int, is_white: bool) -> int:
+    """
+    Squares a set of pawns can move to without capturing.
+
+    Pawns move one square forwards onto an empty square, and another square forwards from their
+    starting row if both squares are empty.
+
+    Args:
+        pawns (int): Bitboard of the squares of the pawns.
+        empty (int): Bitboard of all empty squares.
+        is_white (bool): Whether the pawns are white, which move towards row zero.
+
+    Returns:
+        pushes (int): Bitboard of the target squares.
+    """
+    if is_white:
+        single = (pawns >> 8) & empty
+        return single | ((single & ROWS[5]) >> 8) & empty
+    single = (pawns << 8) & empty
+    return single | ((single & ROWS[2]) << 8) & empty
+
+
+def _ray_attacks(row: int, col: int, directions: tuple[tuple[int, int], ...], occupied: int) -> int:
+    """Squares attacked by a sliding piece, which stops at the first occupied square of a ray."""
+    attacks = 0
+    for row_offset, col_offset in directions:
+        new_row, new_col = row + row_offset, col + col_offset
+        while 0 <= new_row < 8 and 0 <= new_col < 8:
+            bit = 1 << (8 * new_row + new_col)
+            attacks |= bit
+            if occupied & bit:
+                break
+            new_row += row_offset
+            new_col += col_offset
+    return attacks
+
+
+def _relevant_occupancy_mask(row: int, col: int, directions: tuple[tuple[int, int], ...]) -> int:
+    """Squares whose occupancy affects the attacks of a sliding piece.
+
+    The last square of each ray is excluded, as it is attacked whether it is occupied or not.
+    """
+    mask = 0
+    for row_offset, col_offset in directions:
+        new_row, new_col = row + row_offset, col + col_offset
+        while 0 <= new_row + row_offset < 8 and 0 <= new_col + col_offset < 8:
+            mask |= 1 << (8 * new_row + new_col)
+            new_row += row_offset
+            new_col += col_offset
+    return mask
+
+
+def _slider_tables(
+    directions: tuple[tuple[int, int], ...]
+) -> tuple[tuple[int, ...], tuple[dict[int, int], ...]]:
+    """Occupancy masks and attacks for every relevant occupancy of a sliding piece.
+
+    Engines written in C multiply the masked occupancy by a "magic" number to map it to an index
+    in a dense array. Python integers are hashed in constant time, so the masked occupancy is
+    used as a key directly, which gives the same single lookup without searching for magics.
+    """
+    masks = []
+    attacks = []
+    for row in range(8):
+        for col in range(8):
+            # The attacks along a ray only depend on the occupancy of that ray, so the table is
+            # built by combining the attacks for every occupancy of each ray
+            mask = 0
+            table = {0: 0}
+            for direction in directions:
+                ray_mask = _relevant_occupancy_mask(row, col, (direction,))
+                ray_attacks = {}
+                # Enumerate all subsets of the mask (Carry-Rippler trick)
+                subset = 0
+                while True:
+                    ray_attacks[subset] = _ray_attacks(row, col, (direction,), subset)
+                    subset = (subset - ray_mask) & ray_mask
+                    if subset == 0:
+                        break
+                mask |= ray_mask
+                table = {
+                    occupied | ray_occupied: attacked | ray_attacked
+                    for occupied, attacked in table.items()
+                    for ray_occupied, ray_attacked in ray_attacks.items()
+                }
+            masks.append(mask)
+            attacks.append(table)
+    return tuple(masks), tuple(attacks)
+
+
+ROOK_MASKS, ROOK_ATTACKS = _slider_tables(ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_ATTACKS = _slider_tables(BISHOP_DIRECTIONS)
+
+
+def rook_attacks(index: int, occupied: int) -> int:
+    """
+    Squares attacked by a rook.
+
+    Args:
+        index (int): The square 8 * row + col the rook stands on.
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        attacks (int): Bitboard of the attacked squares, including occupied ones.
+    """
+    return ROOK_ATTACKS[index][occupied & ROOK_MASKS[index]]
+
+
+def bishop_attacks(index: int, occupied: int) -> int:
+    """
+    Squares attacked by a bishop.
+
+    Args:
+        index (int): The square 8 * row + col the bishop stands on.
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        attacks (int): Bitboard of the attacked squares, including occupied ones.
+    """
+    return BISHOP_ATTACKS[index][occupied & BISHOP_MASKS[index]]
+
+
+def queen_attacks(index: int, occupied: int) -> int:
+    """
+    Squares attacked by a queen.
+
+    Args:
+        index (int): The square 8 * row + col the queen stands on.
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        attacks (int): Bitboard of the attacked squares, including occupied ones.
+    """
+    return (
+        ROOK_ATTACKS[index][occupied & ROOK_MASKS[index]]
+        | BISHOP_ATTACKS[index][occupied & BISHOP_MASKS[index]]
+    )
+
+
+def _alignment_tables() -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    """Squares between two squares and on the line through two squares, if they are aligned."""
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for row in range(8):
+        for col in range(8):
+            index = 8 * row + col
+            for row_offset, col_offset in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+                full_line = (
+                    (1 << index)
+                    | _ray_attacks(row, col, ((row_offset, col_offset),), 0)
+                    | _ray_attacks(row, col, ((-row_offset, -col_offset),), 0)
+                )
+                squares = 0
+                new_row, new_col = row + row_offset, col + col_offset
+                while 0 <= new_row < 8 and 0 <= new_col < 8:
+                    between[index][8 * new_row + new_col] = squares
+                    line[index][8 * new_row + new_col] = full_line
+                    squares |= 1 << (8 * new_row + new_col)
+                    new_row += row_offset
+                    new_col += col_offset
+    return tuple(map(tuple, between)), tuple(map(tuple, line))
+
+
+# Squares strictly between two squares and all squares of the row, column or diagonal through
+# two squares, indexed by both squares. Zero if the squares are not aligned.
+BETWEEN, LINE = _alignment_tables()
@@ -1,6 +1,4 @@
-from copy import copy, deepcopy
-from itertools import product
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 from .utils import algebraic_to_index, index_to_algebraic
 from ..errors import IllegalMoveError
@@ -9,8 +7,81 @@ from .moves import Move
 from .tree import GameTree, GameTreeNode
 from .result import GameResult
 from .piece import ChessPiece
+from .bitboard import (
+    ALL_SQUARES,
+    BETWEEN,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE,
+    PAWN_ATTACKS,
+    SQUARES,
+    bishop_attacks,
+    iter_bits,
+    pawn_pushes,
+    queen_attacks,
+    rook_attacks,
+)
+
+# Columns which must be empty for castling and columns which the king passes through (including
+# its origin and target), keyed by the target column of the king
+_CASTLING_EMPTY_COLS = {6: (5, 6), 2: (1, 2, 3)}
+_CASTLING_KING_COLS = {6: (4, 5, 6), 2: (4, 3, 2)}
+# The same squares as bitboards, keyed by the row and the target column of the king. Kings
+# outside the first and the last row can not castle.
+_CASTLING_EMPTY_SQUARES = {
+    (row, target_col): sum(1 << (8 * row + col) for col in cols)
+    for row in (0, 7)
+    for target_col, cols in _CASTLING_EMPTY_COLS.items()
+}
+_CASTLING_KING_SQUARES = {
+    (row, target_col): sum(1 << (8 * row + col) for col in cols)
+    for row in (0, 7)
+    for target_col, cols in _CASTLING_KING_COLS.items()
+}
+
+# Row offset of a move and promotion options of pawns, keyed by whether the pawn is white. White
+# pawns move up the board, towards row zero.
+_PAWN_PARAMETERS = {True: (-1, "QRBN"), False: (1, "qrbn")}
+
+# Material values used to order moves, by piece name
+_PIECE_VALUES = {"Pawn": 1, "Knight": 3, "Bishop": 3, "Rook": 5, "Queen": 9, "King": 100}
+
+
+def mvv_lva_score(move: Move) -> int:
+    """
+    Score a move by "most valuable victim, least valuable attacker".
+
+    Captures of valuable pieces by cheap pieces are most likely to be good moves, so searching
+    them first lets alpha-beta pruning cut off more of the remaining moves.
+
+    Args:
+        move (Move): The move.
+
+    Returns:
+        score (int): Higher for more promising captures, zero for quiet moves.
+    """
+    if move.captured_piece is None:
+        return 0
+    return 10 * _PIECE_VALUES[move.captured_piece.name] - _PIECE_VALUES[move.piece.name]
+
+
+def order_moves(moves: list[Move], tt_move: Optional[Move] = None) -> list[Move]:
+    """
+    Order moves such that the most promising ones come first.
+
+    Args:
+        moves (list[Move]): The moves.
+        tt_move (Move, optional): The best move found for this position by an earlier search,
+            which is placed first if it is one of the moves. Defaults to `None`.
 
-from stockfish import Stockfish
+    Returns:
+        moves (list[Move]): The moves, captures first in order of `mvv_lva_score`.
+    """
+    ordered = sorted(moves, key=lambda move: (move.captured_piece is None, -mvv_lva_score(move)))
+    if tt_move is not None and tt_move in ordered:
+        ordered.remove(tt_move)
+        ordered.insert(0, tt_move)
+    return ordered
 
 
 class ChessGame:
@@ -24,7 +95,11 @@ class ChessGame:
 
     def __init__(self):
         self.state = GameState.from_fen_string()
-        self.move_tree = GameTree(deepcopy(self.state))
+        self.move_tree = GameTree(GameState.from_fen_string(self.state.to_fen_string()))
+        # Legal moves in the current position, keyed by origin and include_promotion_options
+        self._possible_moves = {}
+        # All legal moves in the current position, once they have been generated
+        self._legal_moves = None
 
     def smith_to_move(self, move_str):
         """Return a move corresponding from Smith notation"""
@@ -34,6 +109,12 @@ class ChessGame:
             promote_to = move_str[4]
         except IndexError:
             promote_to = None
+        else:
+            # The case of the promotion letter is not significant, the color is that of the pawn
+            if self.state.get_piece_on(*origin).is_white:
+                promote_to = promote_to.upper()
+            else:
+                promote_to = promote_to.lower()
 
         return ChessGame._generate_move(self.state, origin, target, promote_to)
 
@@ -62,86 +143,47 @@ class ChessGame:
             raise IllegalMoveError(f"{move} is not legal in the current position.")
 
         smith_str = self.move_to_smith(move)
-        # self._move_graph.current_tip.append(move)
-        self.state.is_white_active = not self.state.is_white_active
-        if move.is_castling:
-            # Remove castling rights
-            if move.piece.is_white:
-                self.state.castling_rights["K"] = False
-                self.state.castling_rights["Q"] = False
-            else:
-                self.state.castling_rights["k"] = False
-                self.state.castling_rights["q"] = False
-            # Move rook and king
-            rook = self.state.get_piece_on(*move.rook_move.origin)
-            king = self.state.get_piece_on(*move.origin)
-            self.state.place_piece_on(*move.rook_move.origin, None)
-            self.state.place_piece_on(*move.origin, None)
-            self.state.place_piece_on(*move.rook_move.target, rook)
-            self.state.place_piece_on(*move.target, king)
-        else:
-
-            if move.piece.name == "King":
-                if move.piece.is_white:
-                    self.state.castling_rights["K"] = False
-                    self.state.castling_rights["Q"] = False
-                else:
-                    self.state.castling_rights["k"] = False
-                    self.state.castling_rights["q"] = False
-            elif move.piece.name == "Rook":
-                if move.piece.is_white:
-                    if move.origin == (ChessGame.NUM_SQUARES - 1, 0):
-                        # Remove queen side castling right
-                        self.state.castling_rights["Q"] = False
-                    elif move.origin == (ChessGame.NUM_SQUARES - 1, ChessGame.NUM_SQUARES - 1):
-                        # Remove kingside castling right
-                        self.state.castling_rights["K"] = False
-                else:
-                    if move.origin == (0, 0):
-                        # Remove queen side castling right
-                        self.state.castling_rights["q"] = False
-                    elif move.origin == (0, ChessGame.NUM_SQUARES - 1):
-                        # Remove kingside castling right
-                        self.state.castling_rights["k"] = False
-
-            self.state.en_passant_target = None
-            if move.is_double_move:
-                self.state.en_passant_target = (
-                    (move.origin[0] + move.target[0]) // 2,
-                    move.origin[1],
-                )
-
-            if move.piece.name == "Pawn" or move.is_capture:
-                self.state.half_moves = 0
-            else:
-                self.state.half_moves += 1
+        self.state.push(move)
 
-            if self.state.active_color == "white":
-                self.state.moves += 1
+        self._clear_move_cache()
+        self.move_tree.make_move(
+            move, smith_str, self.state.to_fen_string(), self.state.zobrist_hash
+        )
 
-            if move.is_capture:
-                self.state.place_piece_on(*move.captured_piece.coords, None)
-            if move.is_promotion:
-                self.state.place_piece_on(*move.target, move.promote_to)
-            else:
-                self.state.place_piece_on(*move.target, move.piece)
+    def get_all_legal_moves(self):
+        if self._legal_moves is None:
+            moves = []
+            for index in iter_bits(self.state.get_color_bitboard(self.state.is_white_active)):
+                moves += self._get_possible_moves_from(SQUARES[index], self.state, check_safe=True)
+            self._legal_moves = moves
 
-            self.state.place_piece_on(*move.origin, None)
+        return self._legal_moves
 
-        self.move_tree.make_move(move, smith_str, self.state.to_fen_string())
+    def has_any_legal_move(self) -> bool:
+        """
+        Check whether the active color has any legal move.
 
-    def get_all_legal_moves(self):
-        moves = []
-        for row in range(8):
-            for col in range(8):
-                piece = self.state.get_piece_on(row, col)
-                if piece is not None and piece.color == self.state.active_color:
-                    moves += self._get_possible_moves_from((row, col), self.state, check_safe=False)
+        Stops at the first legal move found, starting with the king, which can move in most
+        positions. Uses the legal moves if they have already been generated.
 
-        return moves
+        Returns:
+            has_any_legal_move (bool): Whether there is a legal move.
+        """
+        if self._legal_moves is not None:
+            return len(self._legal_moves) > 0
+        is_white = self.state.is_white_active
+        king = self.state.king_index(is_white)
+        others = self.state.get_color_bitboard(is_white) & ~(1 << king)
+        for index in (king, *iter_bits(others)):
+            for _ in self._get_possible_moves_from(SQUARES[index], self.state, check_safe=True):
+                return True
+        return False
 
     def get_possible_moves_from(
-        self, square: tuple[int, int], include_promotion_options=False
+        self,
+        square: tuple[int, int],
+        include_promotion_options=False,
+        tt_move: Optional[Move] = None,
     ) -> list[Move]:
         """
         Retrieve list of all possible moves that can be by the piece
@@ -150,37 +192,165 @@ class ChessGame:
         Args:
             row (int): The zero-based row index of the square.
             col (int): The zero-based column index of the square.
+            tt_move (Move, optional): Move to return first if it is possible, e.g. the best
+                move found by an earlier search. Defaults to `None`.
+
+        Returns:
+            moves (list[Move]): The possible moves, captures first (see `order_moves`).
+        """
+        key = (square, include_promotion_options)
+        if key not in self._possible_moves:
+            self._possible_moves[key] = order_moves(
+                self._get_possible_moves_from(
+                    square,
+                    self.state,
+                    check_safe=True,
+                    include_promotion_options=include_promotion_options,
+                )
+            )
+        if tt_move is not None:
+            return order_moves(self._possible_moves[key], tt_move)
+        return self._possible_moves[key]
+
+    def get_pseudo_legal_moves_from(
+        self, square: tuple[int, int], include_promotion_options=False
+    ) -> list[Move]:
+        """
+        Retrieve the moves of the piece on a square without checking whether they expose its
+        king. Use `is_legal` to check only the moves which are actually played.
+
+        Args:
+            square (tuple[int, int]): The zero-based row and column index of the square.
 
         Returns:
-            piece (ChessPiece) : The piece currently occupying the square.
+            moves (list[Move]): The pseudo-legal moves.
         """
-        return self._get_possible_moves_from(
-            square, self.state, check_safe=True, include_promotion_options=include_promotion_options
+        return list(
+            self._get_possible_moves_from(
+                square, self.state, include_promotion_options=include_promotion_options
+            )
         )
 
+    def is_pseudo_legal(self, move: Move) -> bool:
+        """
+        Check whether a move, e.g. one remembered from another position, can be made by the
+        active color in the current position if its king safety is ignored.
+
+        Args:
+            move (Move): The move.
+
+        Returns:
+            bool: True if the move is pseudo-legal.
+        """
+        piece = self.state.get_piece_on(*move.origin)
+        if piece is None or piece != move.piece or piece.is_white != self.state.is_white_active:
+            return False
+        return move in self.get_pseudo_legal_moves_from(move.origin, move.is_promotion)
+
+    def is_legal(self, move: Move) -> bool:
+        """
+        Check whether a pseudo-legal move leaves the king of the moving piece safe.
+
+        Args:
+            move (Move): The move, e.g. from `get_pseudo_legal_moves_from`.
+
+        Returns:
+            bool: True if the move is legal.
+        """
+        return ChessGame.is_move_safe(move, self.state)
+
+    def _clear_move_cache(self):
+        """Forget the legal moves computed for the previous position."""
+        self._possible_moves = {}
+        self._legal_moves = None
+
     @staticmethod
     def _get_possible_moves_from(
         square: tuple[int, int],
         state: GameState,
         check_safe=False,
         **kwargs,
-    ) -> list[Move]:
+    ) -> Iterator[Move]:
         piece = state.get_piece_on(*square)
-        moves = getattr(ChessGame, f"_get_possible_{piece.name.lower()}_moves")(
-            square, state, **kwargs
-        )
+        name = piece.name
+        if check_safe and name != "King":
+            # Only generate moves which do not expose the king
+            kwargs["target_mask"] = ChessGame._legal_target_mask(square, state, piece.is_white)
+        moves = _MOVE_GENERATORS[name](square, state, **kwargs)
 
         if check_safe:
-            moves = [move for move in moves if ChessGame.is_move_safe(move, state)]
+            if name == "King":
+                # The king must not move onto an attacked square. Squares behind the king on the
+                # line of an attacking piece are attacked too, once the king has moved.
+                king = 1 << (8 * square[0] + square[1])
+                attacked = state.attacked_squares(not piece.is_white, state.occupied & ~king)
+                moves = (move for move in moves if ChessGame._is_king_move_safe(move, attacked))
+            else:
+                # An en passant capture removes a second piece from the board, which the target
+                # mask does not account for.
+                moves = (
+                    move
+                    for move in moves
+                    if not move.is_capture
+                    or move.captured_piece.coords == move.target
+                    or ChessGame.is_move_safe(move, state)
+                )
 
         return moves
 
+    @staticmethod
+    def _is_king_move_safe(move: Move, attacked: int) -> bool:
+        """
+        Check whether a king move avoids all attacked squares.
+
+        Args:
+            move (Move): The move of the king.
+            attacked (int): Bitboard of the squares attacked by the opponent.
+
+        Returns:
+            bool: True if the king does not end up in, and for castling does not start from or
+                  pass through, an attacked square.
+        """
+        if move.is_castling:
+            return not attacked & _CASTLING_KING_SQUARES[move.target]
+        return not attacked >> (8 * move.target[0] + move.target[1]) & 1
+
+    @staticmethod
+    def _legal_target_mask(square: tuple[int, int], state: GameState, is_white: bool) -> int:
+        """
+        Find the squares to which a piece other than the king may move without exposing its king.
+
+        Args:
+            square (tuple[int, int]): The zero-based row and column index of the piece.
+            state (GameState): The current game state.
+            is_white (bool): Whether the piece is white.
+
+        Returns:
+            target_mask (int): Bitboard of the squares the piece may move to.
+        """
+        index = 8 * square[0] + square[1]
+        king = state.king_index(is_white)
+
+        target_mask = ALL_SQUARES
+        checkers = state.checkers(is_white)
+        if checkers:
+            if checkers & (checkers - 1):
+                # Only the king can escape a double check
+                return 0
+            # Capture the checking piece or block the check
+            checker = checkers.bit_length() - 1
+            target_mask = checkers | BETWEEN[king][checker]
+        if state.pinned(is_white) >> index & 1:
+            # Pinned pieces can only move along the line between king and pinning piece
+            target_mask &= LINE[king][index]
+        return target_mask
+
     @staticmethod
     def _get_possible_king_moves(
         origin: tuple[int, int],
         state: GameState,
         **kwargs,
-    ) -> list[tuple[int, int]]:
+    ) -> Iterator[Move]:
         """
         Calculate all possible moves for a king from its current position on the chessboard.
 
@@ -192,73 +362,64 @@ class ChessGame:
             origin (Square): The chess square object representing the king's current position on
                              the board.
 
-        Returns:
-            list of tuple: A list containing all possible move positions as tuples, where each tuple
-                            represents a row and column index on the chessboard.
+        Yields:
+            move (Move): Each possible move.
         """
-        # Define all possible moves a king can make: one step in any direction
-        move_offsets = [
-            (-1, -1),
-            (-1, 0),
-            (-1, 1),
-            (0, -1),
-            (0, 1),
-            (1, -1),
-            (1, 0),
-            (1, 1),
-        ]
-
-        # List to hold all possible moves
-        possible_moves = []
-
         # Color of the king
         piece = state.get_piece_on(*origin)
 
-        # Check each move offset
-        for row_offset, col_offset in move_offsets:
-            new_row, new_col = origin[0] + row_offset, origin[1] + col_offset
-
-            # If the new position is within the bounds of the chessboard, add it to possible moves
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                if not state.is_occupied(new_row, new_col):
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
-                elif state.get_piece_on(new_row, new_col).is_white != piece.is_white:
-                    # If the square is occupied by an opponent's piece, add it to possible moves
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
+        # Each square one step away in any direction, which is empty or occupied by an opponent
+        targets = KING_ATTACKS[8 * origin[0] + origin[1]] & ~state.get_color_bitboard(piece.is_white)
+        yield from ChessGame._generate_regular_moves(state, piece, origin, targets)
 
         # Check king side castling
         if state.castling_rights["K" if piece.is_white else "k"]:
-            target = origin[0], 6
-            # Check path is free
-            for col in range(origin[1] + 1, target[1] + 1):
-                tmp_square = (origin[0], col)
-                if state.is_occupied(*tmp_square):
-                    break
-            else:
-                possible_moves.append(ChessGame._generate_move(state, origin, target))
+            if not state.occupied & _CASTLING_EMPTY_SQUARES.get((origin[0], 6), ALL_SQUARES):
+                yield ChessGame._generate_move(state, origin, (origin[0], 6))
 
+        # Check queen side castling
         if state.castling_rights["Q" if piece.is_white else "q"]:
-            target = origin[0], 2
-            # Check path is free
-            for col in range(target[1] - 1, origin[1]):
-                tmp_square = (origin[0], col)
-                if state.is_occupied(*tmp_square):
-                    break
-            else:
-                possible_moves.append(ChessGame._generate_move(state, origin, target))
+            if not state.occupied & _CASTLING_EMPTY_SQUARES.get((origin[0], 2), ALL_SQUARES):
+                yield ChessGame._generate_move(state, origin, (origin[0], 2))
+
+    @staticmethod
+    def _get_possible_sliding_moves(
+        origin: tuple[int, int],
+        state: GameState,
+        attacks: Callable[[int, int], int],
+        target_mask: int,
+    ) -> Iterator[Move]:
+        """
+        Calculate all possible moves for a queen, rook or bishop.
+
+        Args:
+            origin (tuple[int, int]): The zero-based row and column index of the piece.
+            state (GameState): The state of the game.
+            attacks (Callable[[int, int], int]): Function returning the squares attacked by the
+                piece from a square for given occupied squares, e.g. `rook_attacks`.
+            target_mask (int): Bitboard of the squares the piece may move to.
+
+        Yields:
+            move (Move): Each possible move.
+        """
+        piece = state.get_piece_on(*origin)
 
-        return possible_moves
+        # Each square along the piece's lines up to and including the first occupied one,
+        # excluding squares occupied by own pieces
+        targets = (
+            attacks(8 * origin[0] + origin[1], state.occupied)
+            & ~state.get_color_bitboard(piece.is_white)
+            & target_mask
+        )
+        yield from ChessGame._generate_regular_moves(state, piece, origin, targets)
 
     @staticmethod
     def _get_possible_queen_moves(
         origin: tuple[int, int],
         state: GameState,
+        target_mask: int = ALL_SQUARES,
         **kwargs,
-    ) -> list[tuple[int, int]]:
+    ) -> Iterator[Move]:
         """
         Calculate all possible moves for a queen from its current position on the chessboard.
 
@@ -270,59 +431,18 @@ class ChessGame:
             origin (Square): The chess square object representing the queen's current position on
                              the board.
 
-        Returns:
-            list of tuple: A list containing all possible move positions as tuples, where each
-                            tuple represents a row and column index on the chessboard.
+        Yields:
+            move (Move): Each possible move.
         """
-        # Define all possible direction in which the queen move: any direction
-        move_offsets = [
-            (-1, 0),
-            (1, 0),
-            (0, -1),
-            (0, 1),
-            (-1, -1),
-            (-1, 1),
-            (1, -1),
-            (1, 1),
-        ]
-        # List to hold all possible moves
-        possible_moves = []
-
-        # Color of the king
-        piece = state.get_piece_on(*origin)
-
-        # Check each move offset
-        for row_offset, col_offset in move_offsets:
-            new_row, new_col = origin[0] + row_offset, origin[1] + col_offset
-            # If the new position is within the bounds of the chessboard, add it to possible moves
-            # and continue in the same direction
-            while 0 <= new_row < 8 and 0 <= new_col < 8:
-                if not state.is_occupied(new_row, new_col):
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
-                elif state.get_piece_on(new_row, new_col).is_white != piece.is_white:
-                    # If the square is occupied by an opponent's piece, add it to possible moves
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
-                    # Stop moving in this direction further
-                    break
-                else:
-                    # The square is occupied by a piece of the same color
-                    # So stop moving in this direction
-                    break
-                new_row += row_offset
-                new_col += col_offset
-
-        return possible_moves
+        return ChessGame._get_possible_sliding_moves(origin, state, queen_attacks, target_mask)
 
     @staticmethod
     def _get_possible_rook_moves(
         origin: tuple[int, int],
         state: GameState,
+        target_mask: int = ALL_SQUARES,
         **kwargs,
-    ) -> list[tuple[int, int]]:
+    ) -> Iterator[Move]:
         """
         Calculate all possible moves for a rook from its current position on the chessboard.
 
@@ -334,51 +454,18 @@ class ChessGame:
             origin (Square): The square object representing the rook's current position on the
                              board.
 
-        Returns:
-            list of tuple: A list containing all possible move positions as tuples, where each
-                            tuple represents a row and column index on the chessboard.
+        Yields:
+            move (Move): Each possible move.
         """
-        # Define all possible direction in which the rook move: any direction
-        move_offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-        # List to hold all possible moves
-        possible_moves = []
-
-        # Color of the rook
-        piece = state.get_piece_on(*origin)
-
-        # Check each move offset
-        for row_offset, col_offset in move_offsets:
-            new_row, new_col = origin[0] + row_offset, origin[1] + col_offset
-            # If the new position is within the bounds of the chessboard, add it to possible moves
-            # and continue in the same direction
-            while 0 <= new_row < 8 and 0 <= new_col < 8:
-                if not state.is_occupied(new_row, new_col):
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
-                elif state.get_piece_on(new_row, new_col).is_white != piece.is_white:
-                    # If the square is occupied by an opponent's piece, add it to possible moves
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
-                    # Stop moving in this direction further
-                    break
-                else:
-                    # The square is occupied by a piece of the same color,
-                    # So stop moving in this direction
-                    break
-                new_row += row_offset
-                new_col += col_offset
-
-        return possible_moves
+        return ChessGame._get_possible_sliding_moves(origin, state, rook_attacks, target_mask)
 
     @staticmethod
     def _get_possible_bishop_moves(
         origin: tuple[int, int],
         state: GameState,
+        target_mask: int = ALL_SQUARES,
         **kwargs,
-    ) -> list[tuple[int, int]]:
+    ) -> Iterator[Move]:
         """
         Calculate all possible moves for a bishop from its current position on the chessboard.
 
@@ -389,144 +476,62 @@ class ChessGame:
         Args:
             origin (Square): The square object representing the rook's current position on the
                              board.
-        Returns:
-            list of tuple: A list containing all possible move positions as tuples, where each tuple
-                            represents a row and column index on the chessboard.
+        Yields:
+            move (Move): Each possible move.
         """
-        # Define all possible direction in which the bishop move: any direction
-        move_offsets = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-
-        # List to hold all possible moves
-        possible_moves = []
-
-        # Color of the bishop
-        piece = state.get_piece_on(*origin)
-
-        # Check each move offset
-        for row_offset, col_offset in move_offsets:
-            new_row, new_col = origin[0] + row_offset, origin[1] + col_offset
-            # If the new position is within the bounds of the chessboard, add it to possible moves
-            # and continue in the same direction
-            while 0 <= new_row < 8 and 0 <= new_col < 8:
-                if not state.is_occupied(new_row, new_col):
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
-                elif state.get_piece_on(new_row, new_col).is_white != piece.is_white:
-                    # If the square is occupied by an opponent's piece, add it to possible moves
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, (new_row, new_col))
-                    )
-                    # Stop moving in this direction further
-                    break
-                else:
-                    # The square is occupied by a piece of the same color
-                    # So stop moving in this direction
-                    break
-                new_row += row_offset
-                new_col += col_offset
-
-        return possible_moves
+        return ChessGame._get_possible_sliding_moves(origin, state, bishop_attacks, target_mask)
 
     @staticmethod
     def _get_possible_knight_moves(
         origin: tuple[int, int],
         state: GameState,
+        target_mask: int = ALL_SQUARES,
         **kwargs,
-    ) -> list[tuple[int, int]]:
-        # Define all possible direction in which the knight move: any direction
-        move_offsets = [
-            (-2, -1),
-            (-2, 1),
-            (-1, -2),
-            (-1, 2),
-            (1, -2),
-            (1, 2),
-            (2, -1),
-            (2, 1),
-        ]
-
-        # List to hold all possible moves
-        possible_moves = []
-
+    ) -> Iterator[Move]:
         # Color of the knight
         piece = state.get_piece_on(*origin)
 
-        # Check each move offset
-        for row_offset, col_offset in move_offsets:
-            target = origin[0] + row_offset, origin[1] + col_offset
-            # If the new position is within the bounds of the chessboard, add it to possible moves
-            if 0 <= target[0] < 8 and 0 <= target[1] < 8:
-                if not state.is_occupied(*target):
-                    possible_moves.append(ChessGame._generate_move(state, origin, target))
-                elif state.get_piece_on(*target).is_white != piece.is_white:
-                    # If the square is occupied by an opponent's piece, add it to possible moves
-                    possible_moves.append(ChessGame._generate_move(state, origin, target))
-
-        return possible_moves
+        # Each square a knight's jump away, which is empty or occupied by an opponent
+        targets = (
+            KNIGHT_ATTACKS[8 * origin[0] + origin[1]]
+            & ~state.get_color_bitboard(piece.is_white)
+            & target_mask
+        )
+        yield from ChessGame._generate_regular_moves(state, piece, origin, targets)
 
     @staticmethod
     def _get_possible_pawn_moves(
         origin: tuple[int, int],
         state: GameState,
         include_promotion_options: bool = False,
+        target_mask: int = ALL_SQUARES,
         **kwargs,
-    ) -> list[tuple[int, int]]:
-
-        # List to hold all possible moves
-        possible_moves = []
-
-        # Color of the pawn
-        piece = state.get_piece_on(*origin)
-        is_white = piece.is_white
-
-        # Determine the direction of movement based on color (white or black)
-        if is_white:
-            move_offset = (-1, 0)  # White pawns move up the board
-            double_move = (-2, 0)  # Double move from starting position
-        else:
-            move_offset = (1, 0)  # Black pawns move down the board
-            double_move = (2, 0)  # Double move from starting position
-
-        promotion_options = "qrbn"
-        if piece.is_white:
-            promotion_options = promotion_options.upper()
-
-        def append_move(state, origin, target):
-            if not include_promotion_options or not target[0] in [0,7] :
-                possible_moves.append(ChessGame._generate_move(state, origin, target))
-            else:
+    ) -> Iterator[Move]:
+
+        # Direction of movement and promotion options of the pawn's color
+        is_white = state.get_piece_on(*origin).is_white
+        row_offset, promotion_options = _PAWN_PARAMETERS[is_white]
+
+        # Pushes onto empty squares and captures of opponent pieces, which must be in the target
+        # mask. En passant captures are not, they are checked for safety once generated.
+        index = 8 * origin[0] + origin[1]
+        attacks = PAWN_ATTACKS[is_white][index]
+        targets = (
+            pawn_pushes(1 << index, ALL_SQUARES & ~state.occupied, is_white)
+            | attacks & state.get_color_bitboard(not is_white)
+        ) & target_mask
+        if state.en_passant_target is not None:
+            targets |= attacks & 1 << (8 * state.en_passant_target[0] + state.en_passant_target[1])
+        targets = [SQUARES[target] for target in iter_bits(targets)]
+
+        # All targets are on the promotion row, if any
+        if include_promotion_options and origin[0] + row_offset in (0, 7):
+            for target in targets:
                 for promote_to in promotion_options:
-                    possible_moves.append(
-                        ChessGame._generate_move(state, origin, target, promote_to=promote_to)
-                    )
-
-        # Check one square forward
-        target = (origin[0] + move_offset[0], origin[1])
-        if 0 <= target[0] < 8:
-            if not state.is_occupied(*target):
-                append_move(state, origin, target)
-
-        # Check two squares forward (only if it's the pawn's first move)
-        if (is_white and origin[0] == 6) or (not is_white and origin[0] == 1):
-            target = (origin[0] + double_move[0], origin[1])
-            if 0 <= target[0] < 8:
-                if not state.is_occupied(*target):
-                    append_move(state, origin, target)
-
-        # Check for captures on the diagonals
-        capture_offsets = [(-1, -1), (-1, 1)] if is_white else [(1, -1), (1, 1)]
-        for offset in capture_offsets:
-            target = origin[0] + offset[0], origin[1] + offset[1]
-            if 0 <= target[0] < 8 and 0 <= target[1] < 8:
-                # Check if target square is occupied by opposite color
-                if state.is_occupied(*target):
-                    if state.get_piece_on(*target).is_white != is_white:
-                        append_move(state, origin, target)
-                elif state.is_en_passant_target(*target):
-                    append_move(state, origin, target)
-                        
-        return possible_moves
+                    yield ChessGame._generate_move(state, origin, target, promote_to=promote_to)
+        else:
+            for target in targets:
+                yield ChessGame._generate_move(state, origin, target)
 
     @staticmethod
     def is_move_safe(
@@ -544,24 +549,16 @@ class ChessGame:
             bool: True if moving the piece to the destination square would not
                     put the player in check, False otherwise.
         """
-        # Simulate the move on a hypothetical board
-        temp_state = deepcopy(state)
-        temp_state.place_piece_on(*move.target, copy(move.piece))
-        temp_state.place_piece_on(*move.origin, None)
-        temp_state.en_passant_target = None
-
-        # Check if the king is in check after the move
-        king_square = temp_state.find_king(move.piece.color)
-
-        safe = not ChessGame.is_attacked(king_square, move.piece.color, temp_state)
+        # Make the move and check if the king is in check afterwards
+        is_white = move.piece.is_white
+        state.push(move)
+        safe = not state.is_attacked(state.king_index(is_white), not is_white)
+        state.pop()
 
-        if move.is_castling:
-            for col in range(move.origin[1], move.target[1] + 1):
-                safe = safe and not ChessGame.is_attacked(
-                    (move.origin[0], col),
-                    move.piece.color,
-                    state,
-                )
+        if safe and move.is_castling:
+            # The king may neither castle out of, through, nor into check
+            attacked = state.attacked_squares(not is_white)
+            safe = not attacked & _CASTLING_KING_SQUARES[move.target]
 
         return safe
 
@@ -581,22 +578,34 @@ class ChessGame:
         Returns:
             bool: True if the square is under attack, False otherwise.
         """
-        # Iterate over all squares on the board
-        for attack_origin in product(range(8), repeat=2):
-            # Check if there is an opponent's piece on this square
-            if (
-                state.is_occupied(*attack_origin)
-                and state.get_piece_on(*attack_origin).color != defending_color
-            ):
-                possible_moves = ChessGame._get_possible_moves_from(
-                    attack_origin, state, check_safe=False
-                )
-                # Check if any of these moves include attacking the king's square
-                for move in possible_moves:
-                    if move.target == square:
-                        return True
+        return state.is_attacked(8 * square[0] + square[1], defending_color != "white")
 
-        return False
+    @staticmethod
+    def _generate_regular_moves(
+        state: GameState, piece: ChessPiece, origin: tuple[int, int], targets: int
+    ) -> Iterator[Move]:
+        """
+        Generate moves which are neither castling, en passant nor a promotion.
+
+        This is the case for all moves of knights, bishops, rooks and queens and for all king
+        moves except castling, which skips the checks for special moves of `_generate_move`.
+        Captures are generated first, and only those need to look up the piece on the target.
+
+        Args:
+            state (GameState): The state of the game.
+            piece (ChessPiece): The moving piece.
+            origin (tuple[int, int]): The zero-based row and column index of the piece.
+            targets (int): Bitboard of the target squares, which may not contain own pieces.
+
+        Yields:
+            move (Move): Each move.
+        """
+        captures = targets & state.occupied
+        for target in iter_bits(captures):
+            target = SQUARES[target]
+            yield Move(piece, origin, target, state.get_piece_on(*target))
+        for target in iter_bits(targets ^ captures):
+            yield Move(piece, origin, SQUARES[target])
 
     @staticmethod
     def _generate_move(
@@ -623,7 +632,7 @@ class ChessGame:
 
         # Promotions
         if promote_to is not None:
-            promote_to = ChessPiece(Stockfish.Piece(promote_to), *target)
+            promote_to = ChessPiece(promote_to, *target)
             if target[0] != (0 if piece.is_white else ChessGame.NUM_SQUARES - 1):
                 raise ValueError("Promotion can only occur at the edge of the board.")
 
@@ -647,10 +656,19 @@ class ChessGame:
         if self.state.half_moves >= 100:
             return GameResult.DRAW_BY_50_MOVE
 
-        # TODO Three fold repitition
-        #   - move up the tree checking if state was equal to current state
-        #   - captures or promotions are early exit conditions
-        #     return GameResult.DRAW_BY_REPETION
+        # Three fold repetition: move up the tree checking if the position was equal to the
+        # current one. Positions before the last capture or pawn move can not be equal.
+        position_hash = self.state.zobrist_hash
+        repetitions = 1
+        node = self.move_tree.pointer
+        for _ in range(self.state.half_moves):
+            node = node.parent
+            if node is None:
+                break
+            if node.position_hash == position_hash:
+                repetitions += 1
+                if repetitions == 3:
+                    return GameResult.DRAW_BY_REPETION
 
         # TODO insufficient material
         # 1) Both sides have one of the following
@@ -660,9 +678,8 @@ class ChessGame:
         #     return GameResult.DRAW_INSUFFICIENT_MATERIAL
 
         # No legal moves left:
-        if len(self.get_all_legal_moves()) == 0:
-            king_square = self.state.find_king(self.state.active_color)
-            if ChessGame.is_attacked(king_square, self.state.active_color, self.state):
+        if not self.has_any_legal_move():
+            if self.state.checkers(self.state.is_white_active):
                 # Checkmate
                 if self.state.is_white_active:
                     return GameResult.WIN_BLACK_CHECKMATE
@@ -673,28 +690,37 @@ class ChessGame:
         return None
 
     def goto(self, node: GameTreeNode):
+        if node is self.move_tree.pointer:
+            # Already in this position
+            return
         self.move_tree.pointer = node
         self.state.load_fen_string(node.fen)
+        self._clear_move_cache()
 
     def move_to_smith(self, move: Move):
         smith_str = ""
         if move.piece.name != "Pawn":
             smith_str += move.piece.symbol.upper()
         ambigous = [False, False]
-        for row in range(8):
-            for col in range(8):
-                if (row, col) == move.origin:
-                    continue
-                piece = self.state.get_piece_on(row, col)
-                if piece is None:
-                    continue
-                if piece.symbol == move.piece.symbol:
-                    if move.target in [m.target for m in self.get_possible_moves_from((row, col))]:
-                        # A piece of the same type can also move to this square
-                        if row == move.origin[0]:
-                            ambigous[0] = True
-                        elif col == move.origin[1]:
-                            ambigous[1] = True
+        origin_index = 8 * move.origin[0] + move.origin[1]
+        # Only pieces attacking the target can move there, and their moves are cached until the
+        # next move is made. Pawn captures always name the file of the pawn.
+        others = 0
+        if move.piece.name != "Pawn":
+            target_index = 8 * move.target[0] + move.target[1]
+            others = (
+                self.state.get_bitboard(move.piece.type)
+                & self.state.attackers_to(target_index, move.piece.is_white)
+                & ~(1 << origin_index)
+            )
+        for index in iter_bits(others):
+            row, col = SQUARES[index]
+            if move.target in [m.target for m in self.get_possible_moves_from((row, col))]:
+                # A piece of the same type can also move to this square
+                if row == move.origin[0]:
+                    ambigous[0] = True
+                elif col == move.origin[1]:
+                    ambigous[1] = True
 
         if ambigous[0]:
             smith_str += index_to_algebraic(*move.origin)[0]
@@ -708,3 +734,14 @@ class ChessGame:
         smith_str += index_to_algebraic(*move.target)
 
         return smith_str
+
+
+# Move generator of each piece type, keyed by the name of the piece
+_MOVE_GENERATORS = {
+    "King": ChessGame._get_possible_king_moves,
+    "Queen": ChessGame._get_possible_queen_moves,
+    "Rook": ChessGame._get_possible_rook_moves,
+    "Bishop": ChessGame._get_possible_bishop_moves,
+    "Knight": ChessGame._get_possible_knight_moves,
+    "Pawn": ChessGame._get_possible_pawn_moves,
+}
@@ -7,9 +7,14 @@ from stockfish import Stockfish
 from ..errors import IllegalMoveError
 from .piece import ChessPiece
 
+# Code of the piece a pawn promotes to, stored in the top bits of the hash of a move
+_PROMOTION_CODES = {None: 0, "N": 1, "B": 2, "R": 3, "Q": 4, "n": 1, "b": 2, "r": 3, "q": 4}
+
 
 class Move:
 
+    __slots__ = ("origin", "piece", "target", "captured_piece", "promote_to", "rook_move")
+
     def __init__(
         self,
         piece: ChessPiece,
@@ -95,19 +100,28 @@ class Move:
                 "Equality can only be evaluated with another instance of the Move class"
             )
 
-        is_equal = self.piece == value.piece
-        is_equal &= self.origin == value.origin
-        is_equal &= self.target == value.target
-        is_equal &= self.captured_piece == value.captured_piece
+        # Compare the squares first, which tells most moves apart without comparing pieces
+        if self.origin != value.origin or self.target != value.target:
+            return False
+        if self.piece != value.piece or self.captured_piece != value.captured_piece:
+            return False
         try:
-            is_equal &= self.promote_to.type == value.promote_to.type
+            return self.promote_to.type == value.promote_to.type
         except AttributeError:
-            is_equal &= self.promote_to == value.promote_to
-
-        return is_equal
+            return self.promote_to == value.promote_to
 
     def __hash__(self):
-        return hash((self.piece.name, self.origin, self.target))
+        """Pack origin, target and promotion into a single integer, like Stockfish's 16-bit moves.
+
+        The moving piece is not part of the hash, as it is determined by the origin of the move in
+        a given position.
+        """
+        return (
+            8 * self.origin[0]
+            + self.origin[1]
+            | (8 * self.target[0] + self.target[1]) << 6
+            | _PROMOTION_CODES[self.promote_to and self.promote_to.symbol] << 12
+        )
 
     @property
     def is_capture(self):
@@ -2,10 +2,45 @@
 
 from stockfish import Stockfish
 
+# Properties of each piece type, computed once instead of on every access.
+_PIECE_NAMES = {piece: piece.name.split("_")[-1].capitalize() for piece in Stockfish.Piece}
+_PIECE_IS_WHITE = {piece: "WHITE" in piece.name for piece in Stockfish.Piece}
+_PIECE_SYMBOLS = {piece: piece.value for piece in Stockfish.Piece}
+# Type, symbol, name, color and side of each piece type, keyed by the type and by its FEN character.
+# Pieces store these once, as looking up an Enum member in a dictionary calls Enum.__hash__, which
+# is implemented in Python.
+_PIECE_PROPERTIES = {
+    piece: (
+        piece,
+        _PIECE_SYMBOLS[piece],
+        _PIECE_NAMES[piece],
+        "white" if _PIECE_IS_WHITE[piece] else "black",
+        _PIECE_IS_WHITE[piece],
+    )
+    for piece in Stockfish.Piece
+}
+_FEN_CHAR_PROPERTIES = {piece.value: properties for piece, properties in _PIECE_PROPERTIES.items()}
+_PIECE_UTF8_SYMBOLS = {
+    Stockfish.Piece.WHITE_KING: "♔",
+    Stockfish.Piece.WHITE_QUEEN: "♕",
+    Stockfish.Piece.WHITE_ROOK: "♖",
+    Stockfish.Piece.WHITE_BISHOP: "♗",
+    Stockfish.Piece.WHITE_KNIGHT: "♘",
+    Stockfish.Piece.WHITE_PAWN: "♙",
+    Stockfish.Piece.BLACK_KING: "♚",
+    Stockfish.Piece.BLACK_QUEEN: "♛",
+    Stockfish.Piece.BLACK_ROOK: "♜",
+    Stockfish.Piece.BLACK_BISHOP: "♝",
+    Stockfish.Piece.BLACK_KNIGHT: "♞",
+    Stockfish.Piece.BLACK_PAWN: "♟",
+}
+
 
 class ChessPiece:
     """Base class for all chess pieces."""
 
+    __slots__ = ("_type", "_symbol", "_name", "_color", "_is_white", "row", "col")
+
     def __init__(
         self,
         piece: Stockfish.Piece,
@@ -13,11 +48,15 @@ class ChessPiece:
         col: int,
     ):
         if isinstance(piece, str):
-            self._type = Stockfish.Piece(piece)
+            try:
+                properties = _FEN_CHAR_PROPERTIES[piece]
+            except KeyError:
+                raise ValueError(f"{piece!r} is not a valid piece symbol.") from None
         else:
             if not isinstance(piece, Stockfish.Piece):
                 raise ValueError(f"Can not create ChessPiece using a piece of type {type(piece)}.")
-            self._type = piece
+            properties = _PIECE_PROPERTIES[piece]
+        self._type, self._symbol, self._name, self._color, self._is_white = properties
         self.row = row
         self.col = col
 
@@ -46,55 +85,26 @@ class ChessPiece:
     @property
     def color(self) -> str:
         """Color of piece (white or black)."""
-        return "white" if self.is_white else "black"
+        return self._color
 
     @property
     def is_white(self) -> bool:
         """Color of piece (white or black )."""
-        if self._type is None:
-            raise ValueError("Piece type None does not have a color.")
-        return "WHITE" in self._type.name
+        return self._is_white
 
     @property
     def name(self) -> str:
         """Name of piece."""
-        if self._type is None:
-            return None
-        return self._type.name.split("_")[-1].capitalize()
+        return self._name
 
     @property
     def symbol(self) -> str:
         """Short name of piece."""
-        c = {
-            "King": "K",
-            "Queen": "Q",
-            "Rook": "R",
-            "Bishop": "B",
-            "Knight": "N",
-            "Pawn": "P",
-        }[self.name]
-        return c.upper() if self.is_white else c.lower()
+        return self._symbol
 
     @property
     def utf8_symbol(self) -> str:
-        return {
-            "white": {
-                "King": "♔",
-                "Queen": "♕",
-                "Rook": "♖",
-                "Bishop": "♗",
-                "Knight": "♘",
-                "Pawn": "♙",
-            },
-            "black": {
-                "King": "♚",
-                "Queen": "♛",
-                "Rook": "♜",
-                "Bishop": "♝",
-                "Knight": "♞",
-                "Pawn": "♟",
-            },
-        }[self.color][self.name]
+        return _PIECE_UTF8_SYMBOLS[self._type]
 
     def update_position(self, row, col):
         """Update position"""
@@ -103,4 +113,5 @@ class ChessPiece:
 
     def promote(self, promote_to: Stockfish.Piece):
         """Promote this piece to a new piece."""
-        self._type = promote_to
+        properties = _PIECE_PROPERTIES[promote_to]
+        self._type, self._symbol, self._name, self._color, self._is_white = properties
@@ -1,10 +1,29 @@
 """This module defines the Game class, which handles the current games state
 and check that the game rules."""
 
+import random
 from typing import Optional
 
+from stockfish import Stockfish
+
 from .utils import index_to_algebraic, algebraic_to_index
 from .piece import ChessPiece
+from .moves import Move
+from .bitboard import (
+    BETWEEN,
+    BISHOP_ATTACKS,
+    BISHOP_MASKS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    ROOK_ATTACKS,
+    ROOK_MASKS,
+    SQUARES,
+    bishop_attacks,
+    iter_bits,
+    pawn_attacks,
+    rook_attacks,
+)
 
 _STARTING_POS = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
 # _STARTING_POS = "r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 1"
@@ -13,21 +32,82 @@ _STARTING_POS = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
 # _STARTING_POS = "7K/q7/6k1/8/8/8/8/8 w - - 0 1"
 # _STARTING_POS = "8/8/8/5k2/3K4/8/8/8 w - - 0 1"
 
+# FEN symbols of the pieces of each color in the order pawn, knight, bishop, rook, queen, king
+_COLOR_SYMBOLS = {True: "PNBRQK", False: "pnbrqk"}
+# Number of empty squares of each digit in the piece placement of a FEN string
+_FEN_EMPTY_SQUARES = {str(n): n for n in range(1, 9)}
+
+# Random keys of each piece on each square, whose XOR identifies the placement of all pieces
+# (Zobrist hashing). A fixed seed keeps hashes reproducible between sessions.
+_rng = random.Random(0)
+_ZOBRIST_KEYS = {
+    symbol: tuple(_rng.getrandbits(64) for _ in range(64))
+    for symbol in _COLOR_SYMBOLS[True] + _COLOR_SYMBOLS[False]
+}
+# Keys of the side to move, of each castling right and of the column of the en passant target,
+# which together with the placement identify the position
+_ZOBRIST_WHITE_TO_MOVE = _rng.getrandbits(64)
+_ZOBRIST_CASTLING = {right: _rng.getrandbits(64) for right in "KQkq"}
+_ZOBRIST_EN_PASSANT = tuple(_rng.getrandbits(64) for _ in range(8))
+del _rng
+
+# Castling rights lost when a rook leaves its square, keyed by the square
+_ROOK_CASTLING_RIGHTS = {(7, 0): "Q", (7, 7): "K", (0, 0): "q", (0, 7): "k"}
+
+# Attack information only depends on the placement of the pieces, so it is shared between all
+# states with the same placement hash. The cache is cleared once it reaches its maximum size.
+_ATTACK_CACHE: dict[tuple, int] = {}
+_ATTACK_CACHE_SIZE = 1 << 14
+
+
+def _cache_attacks(key: tuple, value: int) -> int:
+    if len(_ATTACK_CACHE) >= _ATTACK_CACHE_SIZE:
+        _ATTACK_CACHE.clear()
+    _ATTACK_CACHE[key] = value
+    return value
+
 
 class GameState:
     """Track the current state of the game"""
 
     def __init__(self):
+        # The position is stored as one bitboard per piece type, in which bit 8 * row + col is set
+        # if such a piece occupies the square, together with bitboards of all white, all black
+        # and all pieces. The pieces themselves are kept per square for the user interface.
+        # Bitboards are keyed by FEN symbol, as hashing a string is cheaper than hashing an Enum.
         self._pieces = [None] * 64
+        self._bitboards = dict.fromkeys(_COLOR_SYMBOLS[True] + _COLOR_SYMBOLS[False], 0)
+        self._white = 0
+        self._black = 0
+        self._occupied = 0
+        self._placement_hash = 0
         self.is_white_active = True
         self.en_passant_target = None
         self.castling_rights = {"K": True, "Q": True, "k": True, "q": True}
         self.moves = 0
         self.half_moves = 0
+        # Undo records of the moves made with `push`, most recent last
+        self._history = []
         self.load_fen_string(_STARTING_POS)
 
     def __hash__(self):
-        return hash(self.to_fen_string())
+        return self.zobrist_hash
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        Hash of the position, i.e. the placement of the pieces, the side to move, the castling
+        rights and the en passant target. The move counters are not part of the position.
+        """
+        position_hash = self._placement_hash
+        if self.is_white_active:
+            position_hash ^= _ZOBRIST_WHITE_TO_MOVE
+        for right, allowed in self.castling_rights.items():
+            if allowed:
+                position_hash ^= _ZOBRIST_CASTLING[right]
+        if self.en_passant_target is not None:
+            position_hash ^= _ZOBRIST_EN_PASSANT[self.en_passant_target[1]]
+        return position_hash
 
     def load_fen_string(self, fen_str: str):
         """
@@ -39,26 +119,41 @@ class GameState:
         # Split fen string into blocks
         fen_blocks = fen_str.split(" ")
 
-        row_fen = fen_blocks[0].split("/")
-
-        for row, s in enumerate(row_fen):
-            col = 0
+        # Build the board in one pass and replace the previous one at once, instead of placing
+        # the pieces one by one
+        pieces = [None] * 64
+        bitboards = dict.fromkeys(self._bitboards, 0)
+        placement_hash = 0
+        for row, s in enumerate(fen_blocks[0].split("/")):
+            index = 8 * row
             for c in s:
-                if c.isdigit():
-                    for i in range(int(c)):
-                        self.place_piece_on(row, col + i, None)
-                    col += int(c)
+                if c in _FEN_EMPTY_SQUARES:
+                    index += _FEN_EMPTY_SQUARES[c]
                 else:
-                    piece = ChessPiece(c, row, col)
-                    self.place_piece_on(row, col, piece)
-                    col += 1
+                    pieces[index] = ChessPiece(c, row, index - 8 * row)
+                    bitboards[c] |= 1 << index
+                    placement_hash ^= _ZOBRIST_KEYS[c][index]
+                    index += 1
+
+        self._pieces = pieces
+        self._bitboards = bitboards
+        self._white = sum(map(bitboards.__getitem__, _COLOR_SYMBOLS[True]))
+        self._black = sum(map(bitboards.__getitem__, _COLOR_SYMBOLS[False]))
+        self._occupied = self._white | self._black
+        self._placement_hash = placement_hash
+        # Undo records belong to the previous position
+        self._history = []
 
         # Parse active color
         self.is_white_active = fen_blocks[1] == "w"
 
         # Parse castling rights
-        for key in self.castling_rights:
-            self.castling_rights[key] = key in fen_blocks[2]
+        castling_rights = self.castling_rights
+        for key in castling_rights:
+            castling_rights[key] = False
+        for key in fen_blocks[2]:
+            if key in castling_rights:
+                castling_rights[key] = True
 
         # Parse en passant target square
         if fen_blocks[3] == "-":
@@ -90,39 +185,38 @@ class GameState:
         return game_state
 
     def to_fen_string(self) -> str:
-        s = ""
+        # Piece placement, row by row, with the number of consecutive empty squares as a digit
+        rows = []
         for row in range(8):
-            n_pawns = 0
-            if row > 0:
-                s += "/"
-            for col in range(8):
-                piece = self.get_piece_on(row, col)
-                if piece is not None:
-                    if n_pawns > 0:
-                        s += f"{n_pawns}"
-                        n_pawns = 0
-                    s += piece.symbol
+            parts = []
+            n_empty = 0
+            for piece in self._pieces[8 * row : 8 * row + 8]:
+                if piece is None:
+                    n_empty += 1
                 else:
-                    n_pawns += 1
-            if n_pawns > 0:
-                s += f"{n_pawns}"
-        s += " "
-        s += "w" if self.is_white_active else "b"
-        s += " "
-        castling_allow = False
-        for k, v in self.castling_rights.items():
-            if v:
-                s += k
-                castling_allow = True
-        if not castling_allow:
-            s += "-"
-        s += " "
+                    if n_empty > 0:
+                        parts.append(str(n_empty))
+                        n_empty = 0
+                    parts.append(piece.symbol)
+            if n_empty > 0:
+                parts.append(str(n_empty))
+            rows.append("".join(parts))
+
+        castling = "".join(k for k, v in self.castling_rights.items() if v)
         if self.en_passant_target is not None:
-            s += index_to_algebraic(*self.en_passant_target)
+            en_passant = index_to_algebraic(*self.en_passant_target)
         else:
-            s += "-"
-        s += f" {self.half_moves} {self.moves}"
-        return s
+            en_passant = "-"
+        return " ".join(
+            (
+                "/".join(rows),
+                "w" if self.is_white_active else "b",
+                castling or "-",
+                en_passant,
+                str(self.half_moves),
+                str(self.moves),
+            )
+        )
 
     def __repr__(self) -> str:
         out_lines = []
@@ -155,7 +249,153 @@ class GameState:
 
     def is_occupied(self, row: int, col: int):
         """Check whether a given square on the board is currently occupied"""
-        return self.get_piece_on(row, col) is not None
+        return (self._occupied >> (8 * row + col)) & 1 == 1
+
+    @property
+    def occupied(self) -> int:
+        """Bitboard of all occupied squares."""
+        return self._occupied
+
+    def get_color_bitboard(self, is_white: bool) -> int:
+        """Bitboard of all squares occupied by pieces of one color."""
+        return self._white if is_white else self._black
+
+    def get_bitboard(self, piece_type: Stockfish.Piece) -> int:
+        """Bitboard of all squares occupied by pieces of a given type."""
+        return self._bitboards[piece_type.value]
+
+    def attackers_to(self, index: int, by_white: bool) -> int:
+        """
+        Find all pieces of one color attacking a square.
+
+        Args:
+            index (int): The square 8 * row + col which may be attacked.
+            by_white (bool): Whether to look for white or black attackers.
+
+        Returns:
+            attackers (int): Bitboard of the squares of the attacking pieces.
+        """
+        pawns, knights, bishops, rooks, queens, kings = map(
+            self._bitboards.__getitem__, _COLOR_SYMBOLS[by_white]
+        )
+        occupied = self._occupied
+        return (
+            (PAWN_ATTACKS[not by_white][index] & pawns)
+            | (KNIGHT_ATTACKS[index] & knights)
+            | (KING_ATTACKS[index] & kings)
+            | (BISHOP_ATTACKS[index][occupied & BISHOP_MASKS[index]] & (bishops | queens))
+            | (ROOK_ATTACKS[index][occupied & ROOK_MASKS[index]] & (rooks | queens))
+        )
+
+    def is_attacked(self, index: int, by_white: bool) -> bool:
+        """
+        Check whether any piece of one color attacks a square.
+
+        Same as `attackers_to(index, by_white) != 0`, but returns as soon as an attacker is
+        found, checking the cheap leaper attacks before the sliding ones.
+
+        Args:
+            index (int): The square 8 * row + col which may be attacked.
+            by_white (bool): Whether to look for white or black attackers.
+
+        Returns:
+            is_attacked (bool): Whether the square is attacked.
+        """
+        pawns, knights, bishops, rooks, queens, kings = map(
+            self._bitboards.__getitem__, _COLOR_SYMBOLS[by_white]
+        )
+        if (
+            KNIGHT_ATTACKS[index] & knights
+            or PAWN_ATTACKS[not by_white][index] & pawns
+            or KING_ATTACKS[index] & kings
+        ):
+            return True
+        occupied = self._occupied
+        return bool(
+            ROOK_ATTACKS[index][occupied & ROOK_MASKS[index]] & (rooks | queens)
+            or BISHOP_ATTACKS[index][occupied & BISHOP_MASKS[index]] & (bishops | queens)
+        )
+
+    def attacked_squares(self, by_white: bool, occupied: Optional[int] = None) -> int:
+        """
+        Find all squares attacked by the pieces of one color.
+
+        Args:
+            by_white (bool): Whether to look for squares attacked by white or black.
+            occupied (int, optional): Bitboard of the occupied squares, which block sliding pieces.
+                Defaults to the squares occupied in the current position.
+
+        Returns:
+            attacked (int): Bitboard of the attacked squares.
+        """
+        if occupied is None:
+            occupied = self._occupied
+        key = (self._placement_hash, "attacked", by_white, occupied)
+        if key in _ATTACK_CACHE:
+            return _ATTACK_CACHE[key]
+        pawns, knights, bishops, rooks, queens, kings = map(
+            self._bitboards.__getitem__, _COLOR_SYMBOLS[by_white]
+        )
+        attacked = pawn_attacks(pawns, by_white)
+        for index in iter_bits(knights):
+            attacked |= KNIGHT_ATTACKS[index]
+        for index in iter_bits(kings):
+            attacked |= KING_ATTACKS[index]
+        for index in iter_bits(bishops | queens):
+            attacked |= BISHOP_ATTACKS[index][occupied & BISHOP_MASKS[index]]
+        for index in iter_bits(rooks | queens):
+            attacked |= ROOK_ATTACKS[index][occupied & ROOK_MASKS[index]]
+        return _cache_attacks(key, attacked)
+
+    def checkers(self, is_white: bool) -> int:
+        """
+        Find all pieces giving check to the king of one color.
+
+        Args:
+            is_white (bool): Whether to look for checks of the white or the black king.
+
+        Returns:
+            checkers (int): Bitboard of the squares of the checking pieces.
+        """
+        key = (self._placement_hash, "checkers", is_white)
+        if key in _ATTACK_CACHE:
+            return _ATTACK_CACHE[key]
+        return _cache_attacks(key, self.attackers_to(self.king_index(is_white), not is_white))
+
+    def pinned(self, is_white: bool) -> int:
+        """
+        Find all pieces of one color which are pinned to their king.
+
+        A piece is pinned, if it is the only piece between its king and an opposing sliding
+        piece which would otherwise attack the king.
+
+        Args:
+            is_white (bool): Whether to look for pinned white or black pieces.
+
+        Returns:
+            pinned (int): Bitboard of the squares of the pinned pieces.
+        """
+        key = (self._placement_hash, "pinned", is_white)
+        if key in _ATTACK_CACHE:
+            return _ATTACK_CACHE[key]
+        king = self.king_index(is_white)
+        _, _, bishops, rooks, queens, _ = map(
+            self._bitboards.__getitem__, _COLOR_SYMBOLS[not is_white]
+        )
+        own = self._white if is_white else self._black
+        # Opposing sliders which would attack the king if there were no pieces in between
+        snipers = (rook_attacks(king, 0) & (rooks | queens)) | (
+            bishop_attacks(king, 0) & (bishops | queens)
+        )
+        pinned = 0
+        while snipers:
+            sniper = (snipers & -snipers).bit_length() - 1
+            blockers = BETWEEN[king][sniper] & self._occupied
+            # Exactly one piece in between, which belongs to the king's side
+            if blockers and blockers & (blockers - 1) == 0:
+                pinned |= blockers & own
+            snipers &= snipers - 1
+        return _cache_attacks(key, pinned)
 
     def is_en_passant_target(self, row: int, col: int):
         """Check whether a given square can be targeted by en passant capture"""
@@ -170,10 +410,114 @@ class GameState:
             row (int): The zero-based row index of the square.
             col (int): The zero-based column index of the square.
         """
-        self._pieces[8 * row + col] = piece
+        index = 8 * row + col
+        mask = 1 << index
+        previous = self._pieces[index]
+        if previous is not None:
+            symbol = previous.symbol
+            self._placement_hash ^= _ZOBRIST_KEYS[symbol][index]
+            self._bitboards[symbol] &= ~mask
+            if symbol.isupper():
+                self._white &= ~mask
+            else:
+                self._black &= ~mask
+        self._pieces[index] = piece
+        if piece is not None:
+            symbol = piece.symbol
+            self._placement_hash ^= _ZOBRIST_KEYS[symbol][index]
+            self._bitboards[symbol] |= mask
+            if symbol.isupper():
+                self._white |= mask
+            else:
+                self._black |= mask
+        self._occupied = self._white | self._black
         if piece and piece.coords != (row, col):
             piece.update_position(row, col)
 
+    def push(self, move: Move) -> None:
+        """
+        Make a move on the board, without checking whether it is legal.
+
+        The state is changed in place and the move can be taken back with `pop`, so that many
+        moves can be tried without copying the state.
+
+        Args:
+            move (Move): The move.
+        """
+        self._history.append(
+            (
+                move,
+                self.castling_rights.copy(),
+                self.en_passant_target,
+                self.half_moves,
+                self.moves,
+            )
+        )
+        self.is_white_active = not self.is_white_active
+        castling_rights = self.castling_rights
+        name = move.piece.name
+        if name == "King":
+            if move.piece.is_white:
+                castling_rights["K"] = castling_rights["Q"] = False
+            else:
+                castling_rights["k"] = castling_rights["q"] = False
+        elif name == "Rook" and move.origin in _ROOK_CASTLING_RIGHTS:
+            right = _ROOK_CASTLING_RIGHTS[move.origin]
+            if right.isupper() == move.piece.is_white:
+                castling_rights[right] = False
+        if move.is_capture and move.captured_piece.coords in _ROOK_CASTLING_RIGHTS:
+            # Capturing a rook on its starting square revokes the opponent's right to castle there
+            right = _ROOK_CASTLING_RIGHTS[move.captured_piece.coords]
+            if right.isupper() == move.captured_piece.is_white:
+                castling_rights[right] = False
+
+        self.en_passant_target = None
+        if move.is_double_move:
+            self.en_passant_target = ((move.origin[0] + move.target[0]) // 2, move.origin[1])
+
+        if name == "Pawn" or move.is_capture:
+            self.half_moves = 0
+        else:
+            self.half_moves += 1
+
+        if self.is_white_active:
+            self.moves += 1
+
+        if move.is_castling:
+            # Move the rook, the king is moved like any other piece
+            rook = self._pieces[8 * move.rook_move.origin[0] + move.rook_move.origin[1]]
+            self.place_piece_on(*move.rook_move.origin, None)
+            self.place_piece_on(*move.rook_move.target, rook)
+        if move.is_capture:
+            self.place_piece_on(*move.captured_piece.coords, None)
+        if move.is_promotion:
+            self.place_piece_on(*move.target, move.promote_to)
+        else:
+            self.place_piece_on(*move.target, move.piece)
+        self.place_piece_on(*move.origin, None)
+
+    def pop(self) -> Move:
+        """
+        Take back the last move made with `push`.
+
+        Returns:
+            move (Move): The move which was taken back.
+        """
+        move, castling_rights, self.en_passant_target, self.half_moves, self.moves = (
+            self._history.pop()
+        )
+        self.castling_rights.update(castling_rights)
+        self.is_white_active = not self.is_white_active
+        if move.is_castling:
+            rook = self._pieces[8 * move.rook_move.target[0] + move.rook_move.target[1]]
+            self.place_piece_on(*move.rook_move.target, None)
+            self.place_piece_on(*move.rook_move.origin, rook)
+        self.place_piece_on(*move.target, None)
+        if move.is_capture:
+            self.place_piece_on(*move.captured_piece.coords, move.captured_piece)
+        self.place_piece_on(*move.origin, move.piece)
+        return move
+
     def get_active_color(self) -> str:
         """The currently active color, whose turn it is to move."""
         return "white" if self.is_white_active else "black"
@@ -199,16 +543,17 @@ class GameState:
             return True
         return False
 
+    def king_index(self, is_white: bool) -> int:
+        """The square 8 * row + col of the king of one color, or -1 if it is not on the board."""
+        return self._bitboards["K" if is_white else "k"].bit_length() - 1
+
     def find_king(
         self,
         color: str,
     ) -> tuple[int, int]:
-        for row in range(8):
-            for col in range(8):
-                if self.is_occupied(row, col):
-                    piece = self.get_piece_on(row, col)
-                    if piece.color == color and piece.name.capitalize() == "King":
-                        return (row, col)
+        index = self.king_index(color == "white")
+        if index >= 0:
+            return SQUARES[index]
 
         raise ValueError(
             f"{self.__class__.__name__}._find_king: Can not find the {color} king on the board."
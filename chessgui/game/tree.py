@@ -12,6 +12,9 @@ from .state import GameState
 #
 #
 class GameTreeNode:
+
+    __slots__ = ("parent", "depth", "value", "tag", "fen", "position_hash", "children")
+
     def __init__(
         self,
         depth: int,
@@ -19,23 +22,37 @@ class GameTreeNode:
         move: Optional[Move] = None,
         tag: Optional[str] = "",
         fen: Optional[str] = "",
+        position_hash: Optional[int] = None,
     ):
         self.parent = parent
         self.depth = depth
         self.value = move
         self.tag = tag
         self.fen = fen
+        self.position_hash = position_hash
         self.children = {}
 
-    def add_child(self, move: Move, tag: str, fen: str):
+    def add_child(self, move: Move, tag: str, fen: str, position_hash: Optional[int] = None):
         """Add a child node resulting from applying an action."""
         if move in self.children:
             return self.children[move]  # Avoid duplicate states under the same parent
 
-        child_node = GameTreeNode(parent=self, depth=self.depth+1, move=move, tag=tag, fen=fen)
+        child_node = GameTreeNode(
+            parent=self,
+            depth=self.depth + 1,
+            move=move,
+            tag=tag,
+            fen=fen,
+            position_hash=position_hash,
+        )
         self.children[move] = child_node
         return child_node
 
+    @property
+    def main_child(self) -> Optional[Self]:
+        """The first child added to this node, i.e. the continuation of the main line."""
+        return next(iter(self.children.values()), None)
+
     def get_path(self):
         """Reconstructs the path from the root to this node."""
         path = []
@@ -54,12 +71,14 @@ class GameTree:
     def __init__(self, root_state: GameState):
         """Initialize a tree with a root state."""
         self.root_state = root_state
-        self.root = GameTreeNode(0, fen=root_state.to_fen_string())
+        self.root = GameTreeNode(
+            0, fen=root_state.to_fen_string(), position_hash=root_state.zobrist_hash
+        )
         self.pointer = self.root
         self.tip = self.root
 
-    def make_move(self, move: Move, tag: str, fen: str):
-        self.pointer = self.pointer.add_child(move, tag, fen)
+    def make_move(self, move: Move, tag: str, fen: str, position_hash: Optional[int] = None):
+        self.pointer = self.pointer.add_child(move, tag, fen, position_hash)
         if len(self.pointer.children) == 0:
             self.tip = self.pointer
 
@@ -1,3 +1,9 @@
+# Algebraic notation of every square, indexed by 8 * row + col
+_ALGEBRAIC = tuple(f"{file}{8 - row}" for row in range(8) for file in "abcdefgh")
+# Zero-based row and column of every square, keyed by its algebraic notation
+_INDICES = {name: divmod(index, 8) for index, name in enumerate(_ALGEBRAIC)}
+
+
 def algebraic_to_index(pos: str) -> tuple[int] | None:
     """
     Convert square identifier from algebraic notation to pair of zero-based indices.
@@ -8,10 +14,14 @@ def algebraic_to_index(pos: str) -> tuple[int] | None:
     Returns:
         row (int): The zero-based row index of the square.
         col (int): The zero-based column index of the square.
+
+    Raises:
+        ValueError: If `pos` does not start with the name of a square.
     """
-    row = 8 - int(pos[1])
-    col = "abcdefgh".index(pos[0])
-    return row, col
+    try:
+        return _INDICES[pos[:2]]
+    except KeyError:
+        raise ValueError(f"Invalid square in algebraic notation: {pos!r}") from None
 
 
 def index_to_algebraic(row: int, col: int) -> str:
@@ -28,4 +38,4 @@ def index_to_algebraic(row: int, col: int) -> str:
     Returns:
         pos (str): The identifier in algebraic notation.
     """
-    return "abcdefgh"[col] + str(8 - row)
+    return _ALGEBRAIC[8 * row + col]
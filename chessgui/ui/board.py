@@ -1,12 +1,14 @@
 """This module implements a chess board as a graphical elements"""
 
 import tkinter as tk
+from tkinter.font import Font
 
+from ..game.bitboard import iter_bits
 from ..game.moves import Move
 from ..game.piece import ChessPiece
 from ..game.state import GameState
 from ..ui.square import Square
-from .svg import ChessPieceSVG
+from .svg import REDRAW_DELAY, ChessPieceSVG, prerender_pieces
 
 
 class Board:
@@ -15,28 +17,51 @@ class Board:
     def __init__(self, content_frame: tk.Frame):
         self._canvas = tk.Canvas(content_frame, highlightthickness=0)
         self._canvas.grid(row=0, column=0, sticky="nsew")
-        self._squares: list[Square] = [Square(self._canvas, i // 8, i % 8) for i in range(64)]
+        # Font of the rank and file labels of this board, resized together with the board
+        self._font_size = int(Square.font_scale * self._canvas.winfo_height())
+        self._font = Font(size=self._font_size, weight="bold")
+        self._squares: list[Square] = [
+            Square(self._canvas, i // 8, i % 8, self._font) for i in range(64)
+        ]
         self._pieces: dict[tuple[int, int], ChessPieceSVG] = {}
+        # Bitboards of the selected squares and of the squares showing a move target, such that
+        # only those squares are touched when the highlighting is cleared
+        self._selected_bb = 0
+        self._targets_bb = 0
+        self._size = 1
+        self._pending_draw = None
+        # This is the only resize handler of the board: it redraws squares and pieces.
         content_frame.bind("<Configure>", self.draw)
 
     @property
     def size(self) -> int:
-        return self._canvas.winfo_width()
+        """Width of the board in pixels, as reported by the last resize event."""
+        return self._size
 
     def load_piece_positions(self, game_state: GameState):
         """Setup of all pieces acording to the current game state
 
+        Only squares on which the piece differs from the one currently displayed are updated.
+
         Args:
             game_state (GameState): _description_
         """
-        for piece in self._pieces.values():
-            piece.remove()
-        self._pieces = {}
         for row in range(8):
             for col in range(8):
                 piece = game_state.get_piece_on(row, col)
+                displayed = self._pieces.get((row, col))
+                if displayed is not None:
+                    if piece is not None and displayed.type == piece.type:
+                        continue
+                    displayed.remove()
+                    del self._pieces[(row, col)]
                 if piece is not None:
-                    self._pieces[(row, col)] = ChessPieceSVG(piece, self._canvas, (1 / 8, 1 / 8))
+                    self._pieces[(row, col)] = self._create_piece_svg(piece)
+
+    def _create_piece_svg(self, piece: ChessPiece) -> ChessPieceSVG:
+        svg = ChessPieceSVG(piece, self._canvas, (1 / 8, 1 / 8), bind_configure=False)
+        svg.resize(self._size)
+        return svg
 
     def get_square(self, row: int, col: int) -> Square:
         """Return the square in a given row and column.
@@ -89,32 +114,48 @@ class Board:
             row (int): The zero-based row index of the square.
             col (int): The zero-based column index of the square.
         """
-        # Check whether a square has already been selected
-        square = self.get_square(row, col)
-        # square.
-
-        square.toggle_selected()
+        self._selected_bb ^= 1 << (8 * row + col)
+        self.get_square(row, col).toggle_selected()
 
     def draw(self, event):
+        """Redraw the board after it was resized.
+
+        The redraw is deferred, such that a burst of events only triggers a single redraw
+        using the most recent size.
+        """
+        self._size = event.width
+        if self._pending_draw is None:
+            self._pending_draw = self._canvas.after(REDRAW_DELAY, self._do_draw)
+
+    def _do_draw(self):
+        self._pending_draw = None
+        prerender_pieces(self._size / 8 * 0.95)
+        font_size = int(Square.font_scale * self._size / 8)
+        if font_size != self._font_size:
+            self._font_size = font_size
+            self._font.configure(size=font_size)
         for square in self._squares:
-            square.draw(event)
+            square.resize(self._size)
         for piece in self._pieces.values():
-            piece.draw(event)
+            piece.resize(self._size)
 
     def clear_selection(self):
         """Clear all selected squares."""
-        for square in self._squares:
-            square.clear_selected()
+        for index in iter_bits(self._selected_bb):
+            self._squares[index].clear_selected()
+        self._selected_bb = 0
 
     def show_moves(self, moves: list[Move]):
         """Highlight possible moves."""
         for move in moves:
+            self._targets_bb |= 1 << (8 * move.target[0] + move.target[1])
             self.get_square(*move.target).show_move_target(move.is_capture)
 
     def hide_moves(self):
         """Hide possible moves that were highlight."""
-        for square in self._squares:
-            square.hide_move_target()
+        for index in iter_bits(self._targets_bb):
+            self._squares[index].hide_move_target()
+        self._targets_bb = 0
 
     def make_move(self, move: Move):
         """Make a move on the chess board"""
@@ -4,9 +4,9 @@ class which manages the overall layout and interaction elements of the game.
 """
 
 from pathlib import Path
+import threading
 import tkinter as tk
 from functools import partial
-from multiprocessing import Process
 
 from stockfish import Stockfish
 
@@ -21,6 +21,31 @@ from .promotion_selector import PromotionSelector
 from .square import Square
 from .result_screen import GameResultScreen
 
+# Interval in ms at which the main thread checks whether the engine has started
+ENGINE_POLL_INTERVAL = 50
+
+# The board size is rounded down to a multiple of this many pixels, such that small changes of
+# the window size while dragging do not resize the board
+BOARD_SIZE_STEP = 8
+
+
+def _quantize_board_size(size: float) -> int:
+    return max(BOARD_SIZE_STEP, int(size) // BOARD_SIZE_STEP * BOARD_SIZE_STEP)
+
+
+# Engines by executable path, shared by all games. Every evaluation sets the position first, so
+# games in different tabs can use the same engine process.
+_ENGINES: dict[str, Stockfish] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def _get_engine(stockfish_exe: str) -> Stockfish:
+    """Return the engine for an executable, launching it the first time it is requested."""
+    with _ENGINES_LOCK:
+        if stockfish_exe not in _ENGINES:
+            _ENGINES[stockfish_exe] = Stockfish(path=stockfish_exe)
+        return _ENGINES[stockfish_exe]
+
 
 class GameUI:
     """
@@ -40,6 +65,7 @@ class GameUI:
         self.padding_frame.grid(row=0, column=0, sticky="nsew")
         self.padding_frame.rowconfigure(0, weight=1)
         self.padding_frame.columnconfigure(0, weight=1)
+        self._last_geometry = None
         self.padding_frame.bind("<Configure>", self.enforce_aspect_ratio)
 
         self.board_frame = tk.Frame(self.padding_frame, highlightthickness=0)
@@ -65,20 +91,36 @@ class GameUI:
             self.right_sidebar, self.game.move_tree, self.change_position_callback
         )
 
-        # Engine
+        # Engine: launching stockfish takes a while, so it is started in the background and the
+        # evaluation is shown as soon as it is ready.
+        self.engine = None
+        self._engine_ready = threading.Event()
+        self._engine_failed = False
         if Path(stockfish_exe).is_file():
-            try:
-                self.engine = Stockfish(path=stockfish_exe)
-            except OSError:
-                tk.messagebox.showwarning("No engine selected", "Warning: selected executable could not be loaded.")
-
-            self.engine.set_fen_position(self.game.state.to_fen_string())
-            self.eval_bar.update_eval(self.engine.get_evaluation())
-            self.eval_proc = Process(target=self.eval_bar.update_eval(self.engine.get_evaluation()))
+            threading.Thread(target=self._start_engine, args=(stockfish_exe,), daemon=True).start()
+            self.parent.after(ENGINE_POLL_INTERVAL, self._poll_engine)
         else:
             tk.messagebox.showwarning("No engine selected", "Warning: no valid stockfish executable was selected.")
-            self.engine = None
-            self.eval_proc = None
+
+    def _start_engine(self, stockfish_exe: str):
+        """Launch stockfish. Runs on a worker thread and must not touch any widget."""
+        try:
+            self.engine = _get_engine(stockfish_exe)
+        except Exception:
+            # Exceptions are lost on this thread, so report any failure to the main thread
+            self._engine_failed = True
+        finally:
+            # Always stop the polling on the main thread
+            self._engine_ready.set()
+
+    def _poll_engine(self):
+        """Wait on the main thread for the engine to start, then evaluate the current position."""
+        if not self._engine_ready.is_set():
+            self.parent.after(ENGINE_POLL_INTERVAL, self._poll_engine)
+        elif self._engine_failed:
+            tk.messagebox.showwarning("No engine selected", "Warning: selected executable could not be loaded.")
+        else:
+            self.update_evaluation()
 
     def enforce_aspect_ratio(self, event: tk.Event):
         """
@@ -97,20 +139,36 @@ class GameUI:
             event.height - right_side_bar_height
             > event.width - right_sidebar_width - left_sidebar_width
         ):
-            desired_size = min(
-                event.width - left_sidebar_width, event.height - right_side_bar_height
+            desired_size = _quantize_board_size(
+                min(event.width - left_sidebar_width, event.height - right_side_bar_height)
             )
             right_sidebar_width = desired_size
             right_side_bar_pos = (left_sidebar_width, desired_size)
             y0 = 0
         else:
             right_sidebar_width = min(250, 0.25 * event.width)
-            desired_size = min(event.height, event.width - left_sidebar_width - right_sidebar_width)
+            desired_size = _quantize_board_size(
+                min(event.height, event.width - left_sidebar_width - right_sidebar_width)
+            )
             right_side_bar_height = desired_size
             right_side_bar_pos = (left_sidebar_width + desired_size, 0)
 
             y0 = (event.height - desired_size) // 3
 
+        # Placing the frames again triggers Configure events for the board and the sidebars, so
+        # skip it if the layout did not change.
+        geometry = (
+            desired_size,
+            left_sidebar_width,
+            y0,
+            right_side_bar_pos,
+            right_sidebar_width,
+            right_side_bar_height,
+        )
+        if geometry == self._last_geometry:
+            return
+        self._last_geometry = geometry
+
         self.board_frame.place(
             in_=self.padding_frame,
             x=left_sidebar_width,
@@ -150,18 +208,19 @@ class GameUI:
             for move in self._possible_moves:
                 if square.coords == move.target:
                     if self.game.leads_to_promotion(move):
+                        promotions = {
+                            m.promote_to.name: m
+                            for m in self._possible_moves
+                            if m.target == move.target
+                        }
                         selector = getattr(self, f"{self.game.state.active_color}_selector")
-                        selector.open(move.target, callback=partial(self.move_piece, move))
+                        selector.open(move.target, callback=partial(self.promote_piece, promotions))
                     else:
                         self.move_piece(move)
                     break
             else:
                 self.on_click_callback(event)
 
-        result = self.game.game_result()
-        if result is not None:
-            GameResultScreen(self.board_frame, result)
-
     def select_square(self, square: Square) -> None:
         """Select a square on the chess board to highlight possible moves
 
@@ -174,7 +233,9 @@ class GameUI:
         if piece is not None:
             if piece.color == self.game.state.get_active_color():
                 self.board.select_square(square.row, square.col)
-                self._possible_moves = self.game.get_possible_moves_from(square.coords)
+                self._possible_moves = self.game.get_possible_moves_from(
+                    square.coords, include_promotion_options=True
+                )
                 self.board.show_moves(self._possible_moves)
                 self.selected_square = square
 
@@ -184,19 +245,41 @@ class GameUI:
         self.board.clear_selection()
         self.selected_square = None
 
-    def move_piece(self, move: Move, promote_to: ChessPiece = None):
-        move.promote_to = promote_to
+    def promote_piece(self, moves: dict[str, Move], promote_to: ChessPiece):
+        """Make the promotion move for the piece chosen in the promotion selector.
+
+        Args:
+            moves (dict[str, Move]): The legal promotion moves, keyed by the name of the piece
+                                     being promoted to.
+            promote_to (ChessPiece): The piece chosen in the selector.
+        """
+        self.move_piece(moves[promote_to.name])
+
+    def move_piece(self, move: Move):
         self.game.make_move(move)
         self.board.make_move(move)
         self.moves_overview.make_move(self.game.move_tree.pointer)
-        if self.engine is not None:
-            self.engine.set_fen_position(self.game.state.to_fen_string())
-            if self.eval_proc.is_alive():
-                self.eval_proc.kill()
-            self.eval_proc = Process(target=self.eval_bar.update_eval(self.engine.get_evaluation()))
-            self.eval_proc.run()
+        self.update_evaluation()
+
+        result = self.game.game_result()
+        if result is not None:
+            GameResultScreen(self.board_frame, result)
+
+    def update_evaluation(self):
+        """Let the engine evaluate the current position and display the result.
+
+        This is the only place where the engine is queried, so every change of position costs
+        exactly one evaluation. Until the engine has started, positions are not evaluated.
+        """
+        if not self._engine_ready.is_set() or self.engine is None:
+            return
+        # The game tree already stores the FEN string of every position it records.
+        self.engine.set_fen_position(self.game.move_tree.pointer.fen)
+        self.eval_bar.update_eval(self.engine.get_evaluation())
 
     def change_position_callback(self, node: GameTreeNode):
         self.clear_selection()
+        if node is self.game.move_tree.pointer:
+            return
         self.game.goto(node)
         self.board.load_piece_positions(self.game.state)
@@ -2,11 +2,9 @@
 when promoting a pawn."""
 
 import tkinter as tk
-import tksvg
-from stockfish import Stockfish
 
 from ..files import get_icon
-from .svg import ChessPieceSVG
+from .svg import ChessPieceSVG, load_svg, quantize_size
 from ..game.piece import ChessPiece
 
 
@@ -35,10 +33,11 @@ class PromotionSelector:
         self._pieces = []
         pieces = "QRBN" if color_is_white else "nbrq"
         for i, p in enumerate(pieces):
-            piece = ChessPiece(Stockfish.Piece(p), i, 0)
+            piece = ChessPiece(p, i, 0)
             self._pieces.append(piece)
             self._svgs.append(ChessPieceSVG(piece, self._options_canvas, (1., 0.25)))
         self.cross_svg = None
+        self._cross_handle = None
 
         self._options_canvas.bind("<Button-1>", self.select)
         self._canvas.bind("<Button-1>", self.cancel)
@@ -105,11 +104,14 @@ class PromotionSelector:
                 height=canvas_height - button_height,
             )
 
-            self.cross_svg = tksvg.SvgImage(
-                data=get_icon("Cross").read_text("UTF-8"),
-                scaletoheight=max(1, canvas_width),
-            )
-            self._canvas.create_image(canvas_width / 2, button_posy, image=self.cross_svg)
+            self.cross_svg = load_svg(get_icon("Cross"), quantize_size(canvas_width))
+            if self._cross_handle is None:
+                self._cross_handle = self._canvas.create_image(
+                    canvas_width / 2, button_posy, image=self.cross_svg
+                )
+            else:
+                self._canvas.coords(self._cross_handle, canvas_width / 2, button_posy)
+                self._canvas.itemconfigure(self._cross_handle, image=self.cross_svg)
 
     def hide(self):
         """Hide graphical element"""
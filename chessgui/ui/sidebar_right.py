@@ -88,9 +88,8 @@ class SecondSideBar:
             col2.destroy()
             col3.destroy()
         while True:
-            try:
-                node = list(node.children.values())[0]
-            except IndexError:
+            node = node.main_child
+            if node is None:
                 break
             self.half_move += 1
             if self.half_move % 2 == 1:
@@ -134,20 +133,18 @@ class SecondSideBar:
             white_move.pack(expand=True, fill=tk.X)
             white_move.bind("<Button-1>", partial(self.select, node, self.half_move))
 
-            try:
-                black_move = list(self.black_col.children.values())[-1]
+            black_move = next(reversed(self.black_col.children.values()), None)
+            if black_move is not None:
                 black_move.configure(bg="#ffffff")
-            except IndexError:
-                pass
 
             black_move = tk.Label(
                 self.black_col, text="", font=self.font, justify="left", bg="#ffffff"
             )
             black_move.pack(expand=True, fill=tk.X)
         else:
-            white_move = list(self.white_col.children.values())[-1]
+            white_move = next(reversed(self.white_col.children.values()))
             white_move.configure(bg="#ffffff")
-            black_move = list(self.black_col.children.values())[-1]
+            black_move = next(reversed(self.black_col.children.values()))
             black_move.configure(text=node.tag, bg="lightblue")
             black_move.bind("<Button-1>", partial(self.select, node, self.half_move))
 
@@ -211,7 +208,7 @@ class SecondSideBar:
                 list(self.white_col.children.values())[self.half_move//2].configure(bg="lightblue")
             else:
                 list(self.black_col.children.values())[self.half_move//2-1].configure(bg="lightblue")
-            self.goto_state_callback(list(self.move_tree.pointer.children.values())[0])
+            self.goto_state_callback(self.move_tree.pointer.main_child)
     
     def goto_last_pos(self, event):
         for w in self.white_col.children.values():
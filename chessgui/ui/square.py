@@ -5,6 +5,7 @@ import tkinter as tk
 from tkinter.font import Font
 
 from ..files import get_icon
+from ..game.utils import index_to_algebraic
 from .svg import SVGContainer
 from .colors import _COLORS
 
@@ -14,7 +15,7 @@ class Square:
 
     font_scale = 0.14
 
-    def __init__(self, canvas: tk.Canvas, row: int, col: int):
+    def __init__(self, canvas: tk.Canvas, row: int, col: int, font: Font):
         self._canvas = canvas
         self._size = 1
         self._x = col
@@ -27,12 +28,9 @@ class Square:
         self.selected = False
         self.move_highlight = None
         self.color = "light" if (row + col) % 2 == 0 else "dark"
-        self._canvas.bind("<Configure>", self.draw, add=True)
 
-        self.font = Font(
-            size=int(self.font_scale * self._canvas.winfo_height()),
-            weight="bold",
-        )
+        # Font of the rank and file labels, shared by all squares of a board and resized by it
+        self.font = font
 
         self.rank_label = None
         self.file_label = None
@@ -47,8 +45,9 @@ class Square:
             posx=self._x + self._size / 2,
             posy=self._y + self._size / 2,
             scale=(1 / 8, 1 / 8),
+            bind_configure=False,
+            visible=False,
         )
-        self._circlesvg.remove()
 
         self._dotsvg = SVGContainer(
             get_icon("Dot"),
@@ -56,8 +55,9 @@ class Square:
             posx=self._x + self._size / 2,
             posy=self._y + self._size / 2,
             scale=(1 / 8, 1 / 8),
+            bind_configure=False,
+            visible=False,
         )
-        self._dotsvg.remove()
 
     def __repr__(self):
         return f"<{self.__class__.__name__}: ({self._row}, {self._col})>"
@@ -125,24 +125,29 @@ class Square:
         self.refresh_color()
 
     def to_index(self):
-        return self.row, self.col
+        return self._row, self._col
 
     def to_algebraic(self):
         """Return algebraic notation for current square"""
-        row, col = self.to_index()
-        return "abcdefgh"[col] + str(8 - row)
+        return index_to_algebraic(self._row, self._col)
+
+    def resize(self, board_size: float):
+        """Reposition and rescale the square to match the size of the board.
 
-    def draw(self, event):
-        self._size = event.width / 8
+        Args:
+            board_size (float): The width of the board in pixels.
+        """
+        self._size = board_size / 8
         self._x = x0 = self.col * self._size
         x1 = (self.col + 1) * self._size
         self._y = y0 = self.row * self._size
         y1 = (self.row + 1) * self._size
 
         self._canvas.coords(self._id, x0, y0, x1, y1)
-        self.font.configure(size=int(self.font_scale * self._size))
         self._circlesvg.update_pos(x0 + self._size / 2, y0 + self._size / 2)
+        self._circlesvg.resize(board_size)
         self._dotsvg.update_pos(x0 + self._size / 2, y0 + self._size / 2)
+        self._dotsvg.resize(board_size)
 
         if self.rank_label is not None:
             self._canvas.moveto(
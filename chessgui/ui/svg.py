@@ -11,6 +11,9 @@ piece type for convenience.
 """
 
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 import tksvg
@@ -37,6 +40,73 @@ _PIECE_SVGS = {
     },
 }
 
+# Rasterized sizes are rounded to a multiple of this many pixels, so that images are only
+# rendered at a small set of sizes and jitter while resizing the window reuses cached images.
+_SVG_SIZE_STEP = 8
+
+# Delay (in ms) used to coalesce bursts of <Configure> events into a single redraw.
+REDRAW_DELAY = 16
+
+
+# SVG files are read on background threads. Rasterizing creates a Tk image, which has to happen
+# on the thread running the Tk main loop.
+_SVG_READER = ThreadPoolExecutor(max_workers=2)
+
+
+@lru_cache(maxsize=None)
+def _prefetch_svg(file: Path) -> Future:
+    """Start reading an SVG file in the background (only once per file)."""
+    return _SVG_READER.submit(file.read_text, "UTF-8")
+
+
+def _read_svg(file: Path) -> str:
+    """Content of an SVG file, waiting for the background read to finish if necessary."""
+    return _prefetch_svg(file).result()
+
+
+@lru_cache(maxsize=256)
+def load_svg(file: Path, size: int) -> tksvg.SvgImage:
+    """
+    Rasterized image of an SVG file.
+
+    Images are cached per file and size, since parsing and rasterizing SVGs is expensive.
+
+    Args:
+        file (Path): The SVG file.
+        size (int): The height of the image in pixels.
+
+    Returns:
+        tksvg.SvgImage: The rasterized image.
+    """
+    return tksvg.SvgImage(data=_read_svg(file), scaletoheight=size)
+
+
+for _files in _PIECE_SVGS.values():
+    for _file in _files.values():
+        _prefetch_svg(_file)
+for _name in ("Circle", "Dot", "Cross"):
+    _prefetch_svg(get_icon(_name))
+
+
+def quantize_size(size: float) -> int:
+    """Round an image size to the step used for caching rasterized images."""
+    return max(_SVG_SIZE_STEP, _SVG_SIZE_STEP * round(size / _SVG_SIZE_STEP))
+
+
+def prerender_pieces(size: float):
+    """
+    Rasterize the images of all pieces for a given size in a single pass.
+
+    Afterwards, redrawing pieces at this size only swaps cached images.
+
+    Args:
+        size (float): The height of the piece images in pixels.
+    """
+    size = quantize_size(size)
+    for files in _PIECE_SVGS.values():
+        for file in files.values():
+            load_svg(file, size)
+
 
 class SVGContainer:
     def __init__(
@@ -46,7 +116,9 @@ class SVGContainer:
         posx: float,
         posy: float,
         scale: tuple[float, float],
-        centered: Optional[bool] = False
+        centered: Optional[bool] = False,
+        bind_configure: bool = True,
+        visible: bool = True,
     ):
         self._canvas = canvas
         self._posx = posx
@@ -54,13 +126,17 @@ class SVGContainer:
         self._scale = scale
         self._centered = centered
 
-        self._svg_string = file.read_text("UTF-8")
+        self._file = file
         self._svg_img = None
         self._svg_handle = None
-        self._is_visible = True
+        # Hidden containers do not create a canvas item until they are shown
+        self._is_visible = visible
+        self._pending_draw = None
+        self._pending_size = None
 
         self.scale_svg(100)
-        self._canvas.bind("<Configure>", self.draw, add=True)
+        if bind_configure:
+            self._canvas.bind("<Configure>", self.draw, add=True)
 
     @property
     def size(self):
@@ -85,13 +161,17 @@ class SVGContainer:
 
     def scale_svg(self, size: int) -> tksvg.SvgImage:
         """SVG string for piece render."""
-        self._svg_img = tksvg.SvgImage(data=self._svg_string, scaletoheight=size)
+        self._svg_img = load_svg(self._file, quantize_size(size))
         if self._is_visible:
-            self._svg_handle = self._canvas.create_image(
-                self.posx,
-                self.posy,
-                image=self._svg_img,
-            )
+            if self._svg_handle is None:
+                self._svg_handle = self._canvas.create_image(
+                    self.posx,
+                    self.posy,
+                    image=self._svg_img,
+                )
+            else:
+                self._canvas.coords(self._svg_handle, self.posx, self.posy)
+                self._canvas.itemconfigure(self._svg_handle, image=self._svg_img)
 
     def update_pos(self, posx, posy):
         self._posx = posx
@@ -101,20 +181,39 @@ class SVGContainer:
     def draw(self, event):
         """Resize the canvas and reposition pieces when resized.
 
+        The redraw is deferred, such that a burst of events only triggers a single redraw
+        using the most recent size.
+
         Args:
             event (tkinter.Event): The event triggered by resizing.
 
         Returns:
             None
         """
-        self.scale_svg(event.height * self._scale[1] * 0.95)
+        self._pending_size = event.height
+        if self._pending_draw is None:
+            self._pending_draw = self._canvas.after(REDRAW_DELAY, self._do_draw)
+
+    def _do_draw(self):
+        self._pending_draw = None
+        self.resize(self._pending_size)
+
+    def resize(self, canvas_height: float):
+        """Rescale the image to match the height of the canvas.
+
+        Args:
+            canvas_height (float): The height of the canvas in pixels.
+        """
+        self.scale_svg(canvas_height * self._scale[1] * 0.95)
 
     def show(self):
         self._is_visible = True
         self.scale_svg(self.size)
 
     def remove(self):
-        self._canvas.delete(self._svg_handle)
+        if self._svg_handle is not None:
+            self._canvas.delete(self._svg_handle)
+            self._svg_handle = None
         self._is_visible = False
 
     @property
@@ -130,6 +229,7 @@ class ChessPieceSVG(SVGContainer):
         piece: ChessPiece,
         canvas: tk.Canvas,
         scale: float,
+        bind_configure: bool = True,
     ):
         self._piece = piece
         super().__init__(
@@ -138,11 +238,17 @@ class ChessPieceSVG(SVGContainer):
             self._piece.col,
             (7 - self._piece.row),
             scale,
+            bind_configure=bind_configure,
         )
 
     def __repr__(self):
         return self._piece.type.__repr__
 
+    @property
+    def type(self):
+        """Type of the displayed piece"""
+        return self._piece.type
+
     @property
     def posx(self):
         return self._canvas.winfo_width() * self._scale[0] * (self._piece.col + 0.5)
@@ -157,6 +263,6 @@ class ChessPieceSVG(SVGContainer):
         self.scale_svg(self._svg_img.height())
 
     def promote(self, promote_to: ChessPiece):
-        self._piece.promote(promote_to.type)
-        self._svg_string = _PIECE_SVGS[self._piece.color][self._piece.name].read_text()
+        self._piece = promote_to
+        self._file = _PIECE_SVGS[self._piece.color][self._piece.name]
         self.scale_svg(self._svg_img.height())
@@ -1,2 +1,5 @@
 from .piece import TestChessPiece
-from .moves import TestMove
\ No newline at end of file
+from .moves import TestMove
+from .state import TestGameStateBitboards
+from .bitboard import TestBitboard
+from .legal_moves import TestLegalMoves
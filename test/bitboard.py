@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from chessgui.game.bitboard import (
+    ALL_SQUARES,
+    BETWEEN,
+    BISHOP_DIRECTIONS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE,
+    ROOK_DIRECTIONS,
+    _ray_attacks,
+    bishop_attacks,
+    iter_bits,
+    pawn_pushes,
+    queen_attacks,
+    rook_attacks,
+)
+
+
+class TestBitboard(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [0, []],
+            [1, [0]],
+            [0b1010, [1, 3]],
+            [1 << 63 | 1 << 7, [7, 63]],
+        ]
+    )
+    def test_iter_bits(self, bitboard, indices):
+        self.assertEqual(list(iter_bits(bitboard)), indices)
+
+    @parameterized.expand(
+        [
+            [(0, 0), [(0, 1), (1, 0), (1, 1)]],
+            [(7, 4), [(6, 3), (6, 4), (6, 5), (7, 3), (7, 5)]],
+            [(3, 3), [(2, 2), (2, 3), (2, 4), (3, 2), (3, 4), (4, 2), (4, 3), (4, 4)]],
+        ]
+    )
+    def test_king_attacks(self, square, targets):
+        attacks = KING_ATTACKS[8 * square[0] + square[1]]
+        self.assertEqual([divmod(index, 8) for index in iter_bits(attacks)], targets)
+
+    @parameterized.expand(
+        [
+            [(0, 0), [(1, 2), (2, 1)]],
+            [(7, 6), [(5, 5), (5, 7), (6, 4)]],
+            [(4, 4), [(2, 3), (2, 5), (3, 2), (3, 6), (5, 2), (5, 6), (6, 3), (6, 5)]],
+        ]
+    )
+    def test_knight_attacks(self, square, targets):
+        attacks = KNIGHT_ATTACKS[8 * square[0] + square[1]]
+        self.assertEqual([divmod(index, 8) for index in iter_bits(attacks)], targets)
+
+    @parameterized.expand(
+        [
+            # Pawns on their starting row can move two squares, unless either one is occupied
+            [[(6, 0), (6, 3), (6, 5)], [(5, 3), (4, 5)], True, [(4, 0), (5, 0), (5, 5)]],
+            [[(1, 2), (1, 7)], [(3, 2)], False, [(2, 2), (2, 7), (3, 7)]],
+            # Pawns on other rows can only move one square
+            [[(5, 1), (2, 6)], [], False, [(3, 6), (6, 1)]],
+        ]
+    )
+    def test_pawn_pushes(self, pawns, occupied, is_white, targets):
+        pawns = sum(1 << (8 * row + col) for row, col in pawns)
+        empty = ALL_SQUARES & ~sum(1 << (8 * row + col) for row, col in occupied) & ~pawns
+        pushes = pawn_pushes(pawns, empty, is_white)
+        self.assertEqual([divmod(index, 8) for index in iter_bits(pushes)], targets)
+
+    def test_rook_attacks(self):
+        # Rook on a1 blocked by pieces on a4 and c1
+        occupied = 1 << 32 | 1 << 58
+        attacks = rook_attacks(56, occupied)
+        self.assertEqual(
+            [divmod(index, 8) for index in iter_bits(attacks)],
+            [(4, 0), (5, 0), (6, 0), (7, 1), (7, 2)],
+        )
+
+    def test_bishop_attacks(self):
+        # Bishop on d4 blocked by pieces on f6 and b2
+        occupied = 1 << 21 | 1 << 49
+        attacks = bishop_attacks(35, occupied)
+        self.assertEqual(
+            [divmod(index, 8) for index in iter_bits(attacks)],
+            [(1, 0), (2, 1), (2, 5), (3, 2), (3, 4), (5, 2), (5, 4), (6, 1), (6, 5), (7, 6)],
+        )
+
+    def test_slider_tables_match_rays(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            occupied = rng.getrandbits(64) & rng.getrandbits(64)
+            for index in range(64):
+                row, col = divmod(index, 8)
+                self.assertEqual(
+                    rook_attacks(index, occupied), _ray_attacks(row, col, ROOK_DIRECTIONS, occupied)
+                )
+                self.assertEqual(
+                    bishop_attacks(index, occupied),
+                    _ray_attacks(row, col, BISHOP_DIRECTIONS, occupied),
+                )
+                self.assertEqual(
+                    queen_attacks(index, occupied),
+                    _ray_attacks(row, col, ROOK_DIRECTIONS + BISHOP_DIRECTIONS, occupied),
+                )
+
+    @parameterized.expand(
+        [
+            # a1 and a4 share a column
+            [56, 32, [(5, 0), (6, 0)], [(row, 0) for row in range(8)]],
+            # b2 and e5 share a diagonal
+            [49, 28, [(4, 3), (5, 2)], [(row, 7 - row) for row in range(8)]],
+            # a1 and b3 are not aligned
+            [56, 41, [], []],
+        ]
+    )
+    def test_alignment_tables(self, square1, square2, between, line):
+        for first, second in ((square1, square2), (square2, square1)):
+            self.assertEqual([divmod(i, 8) for i in iter_bits(BETWEEN[first][second])], between)
+            self.assertEqual([divmod(i, 8) for i in iter_bits(LINE[first][second])], line)
@@ -0,0 +1,125 @@
+import unittest
+
+from parameterized import parameterized
+
+from chessgui.game.game import ChessGame
+from chessgui.game.result import GameResult
+from chessgui.game.utils import algebraic_to_index, index_to_algebraic
+
+
+class TestLegalMoves(unittest.TestCase):
+
+    def setUp(self):
+        self.game = ChessGame()
+
+    def load(self, fen_str):
+        self.game.state.load_fen_string(fen_str)
+        self.game._clear_move_cache()
+
+    def targets(self, square):
+        moves = self.game.get_possible_moves_from(algebraic_to_index(square))
+        return sorted(index_to_algebraic(*move.target) for move in moves)
+
+    @parameterized.expand(
+        [
+            # Pawns can not jump over a piece with a double move
+            ["4k3/8/8/8/8/2n5/2P5/4K3 w - - 0 1", "c2", []],
+            ["4k3/8/8/8/2n5/8/2P5/4K3 w - - 0 1", "c2", ["c3"]],
+            # En passant capture of the pawn giving check
+            ["8/8/8/2k5/2pP4/8/B7/4K3 b - d3 0 3", "c4", ["d3"]],
+            # En passant capture exposing the king along the rank
+            ["8/8/8/8/k1pP3R/8/8/4K3 b - d3 0 1", "c4", ["c3"]],
+            # Pinned pieces can only move along the pin
+            ["4k3/4r3/8/8/8/8/4R3/4K3 w - - 0 1", "e2", ["e3", "e4", "e5", "e6", "e7"]],
+            ["4k3/8/8/b7/8/8/3N4/4K3 w - - 0 1", "d2", []],
+            # Only blocking or capturing resolves a check
+            ["4k3/4r3/8/8/8/8/3R4/4K3 w - - 0 1", "d2", ["e2"]],
+            # No castling through an attacked square
+            ["4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "e1", ["c1", "d1", "d2", "e2", "f1", "f2", "g1"]],
+            ["3rk3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "e1", ["e2", "f1", "f2", "g1"]],
+        ]
+    )
+    def test_possible_moves(self, fen_str, square, targets):
+        self.load(fen_str)
+        self.assertEqual(self.targets(square), targets)
+
+    @parameterized.expand(
+        [
+            ["4k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8q", "Q"],
+            ["4k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8N", "N"],
+            ["4k3/8/8/8/8/8/6p1/4K3 b - - 0 1", "g2g1r", "r"],
+        ]
+    )
+    def test_smith_to_move_promotion(self, fen_str, move_str, symbol):
+        self.load(fen_str)
+        move = self.game.smith_to_move(move_str)
+        self.assertEqual(move.promote_to.symbol, symbol)
+
+    def test_move_ordering(self):
+        # Captures come first, the most valuable victim first
+        self.load("4k3/8/8/8/1r6/8/3Q3p/4K3 w - - 0 1")
+        moves = self.game.get_possible_moves_from(algebraic_to_index("d2"))
+        self.assertEqual([index_to_algebraic(*move.target) for move in moves[:2]], ["b4", "h2"])
+        self.assertFalse(any(move.is_capture for move in moves[2:]))
+
+        tt_move = moves[-1]
+        moves = self.game.get_possible_moves_from(algebraic_to_index("d2"), tt_move=tt_move)
+        self.assertIs(moves[0], tt_move)
+        self.assertEqual([index_to_algebraic(*move.target) for move in moves[1:3]], ["b4", "h2"])
+
+    @parameterized.expand(
+        [
+            ["R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1", GameResult.WIN_WHITE_CHECKMATE],
+            ["7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", GameResult.DRAW_BY_STALEMATE],
+            ["6k1/5ppp/8/8/8/8/8/R5K1 b - - 0 1", None],
+        ]
+    )
+    def test_game_result(self, fen_str, result):
+        self.load(fen_str)
+        self.assertEqual(self.game.has_any_legal_move(), result is None)
+        self.assertEqual(self.game.game_result(), result)
+
+    def test_threefold_repetition(self):
+        for _ in range(2):
+            for move_str in ("g1f3", "g8f6", "f3g1", "f6g8"):
+                self.assertIsNone(self.game.game_result())
+                self.game.make_move(self.game.smith_to_move(move_str))
+        self.assertEqual(self.game.game_result(), GameResult.DRAW_BY_REPETION)
+
+    @parameterized.expand(
+        [
+            ["4k3/8/8/8/8/8/8/R3K2R w - - 0 1", "a1d1", "Rd1"],
+            ["4k3/8/8/R7/8/8/8/R3K3 w - - 0 1", "a1a3", "R1a3"],
+            ["4k3/8/8/8/8/8/8/R4RK1 w - - 0 1", "a1c1", "Rac1"],
+            ["4k3/8/8/3p4/2P1P3/8/8/4K3 w - - 0 1", "c4d5", "cxd5"],
+        ]
+    )
+    def test_move_to_smith(self, fen_str, move_str, smith_str):
+        self.load(fen_str)
+        self.assertEqual(self.game.move_to_smith(self.game.smith_to_move(move_str)), smith_str)
+
+    def test_all_legal_moves_cache(self):
+        moves = self.game.get_all_legal_moves()
+        self.assertEqual(len(moves), 20)
+        self.assertIs(self.game.get_all_legal_moves(), moves)
+        self.game.make_move(self.game.smith_to_move("e2e4"))
+        self.assertIsNot(self.game.get_all_legal_moves(), moves)
+        self.assertTrue(all(move.piece.color == "black" for move in self.game.get_all_legal_moves()))
+
+    def test_pseudo_legal_moves(self):
+        # The knight is pinned, none of its moves is legal
+        self.load("4k3/8/8/b7/8/8/3N4/4K3 w - - 0 1")
+        moves = self.game.get_pseudo_legal_moves_from(algebraic_to_index("d2"))
+        self.assertEqual(len(moves), 6)
+        self.assertTrue(all(self.game.is_pseudo_legal(move) for move in moves))
+        self.assertFalse(any(self.game.is_legal(move) for move in moves))
+
+        moves = self.game.get_pseudo_legal_moves_from(algebraic_to_index("e1"))
+        self.assertEqual(
+            sorted(index_to_algebraic(*move.target) for move in moves if self.game.is_legal(move)),
+            self.targets("e1"),
+        )
+
+        # Moves of the other color are not pseudo-legal
+        move = self.game.get_pseudo_legal_moves_from(algebraic_to_index("a5"))[0]
+        self.assertFalse(self.game.is_pseudo_legal(move))
@@ -0,0 +1,233 @@
+import unittest
+
+from parameterized import parameterized
+from stockfish import Stockfish
+
+from chessgui.game.bitboard import SQUARES, iter_bits
+from chessgui.game.game import ChessGame
+from chessgui.game.piece import ChessPiece
+from chessgui.game.state import GameState
+
+
+class TestGameStateBitboards(unittest.TestCase):
+
+    def setUp(self):
+        self.state = GameState()
+
+    def assert_bitboards_match_pieces(self):
+        occupied = 0
+        for index in range(64):
+            piece = self.state.get_piece_on(*divmod(index, 8))
+            for piece_type in Stockfish.Piece:
+                bit = (self.state.get_bitboard(piece_type) >> index) & 1
+                self.assertEqual(bit, int(piece is not None and piece.type == piece_type))
+            if piece is not None:
+                occupied |= 1 << index
+                self.assertTrue((self.state.get_color_bitboard(piece.is_white) >> index) & 1)
+                self.assertFalse((self.state.get_color_bitboard(not piece.is_white) >> index) & 1)
+        self.assertEqual(self.state.occupied, occupied)
+
+    @parameterized.expand(
+        [
+            ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"],
+            ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"],
+            ["8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"],
+        ]
+    )
+    def test_load_fen_string(self, fen_str):
+        self.state.load_fen_string(fen_str)
+        self.assert_bitboards_match_pieces()
+        self.assertEqual(self.state.to_fen_string(), fen_str)
+
+    def test_place_piece_on(self):
+        self.state.place_piece_on(4, 4, ChessPiece("Q", 4, 4))
+        self.state.place_piece_on(0, 3, None)
+        self.state.place_piece_on(1, 0, ChessPiece("N", 1, 0))
+        self.assert_bitboards_match_pieces()
+        self.assertFalse(self.state.is_occupied(0, 3))
+        self.assertTrue(self.state.is_occupied(4, 4))
+
+    @parameterized.expand(
+        [
+            ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "white", (7, 4)],
+            ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "black", (0, 4)],
+            ["8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", "white", (3, 0)],
+            ["8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", "black", (4, 7)],
+        ]
+    )
+    def test_find_king(self, fen_str, color, coords):
+        self.state.load_fen_string(fen_str)
+        self.assertEqual(self.state.find_king(color), coords)
+
+    @parameterized.expand(
+        [
+            # Knight on f3 and bishop on c4 attack e5 and f7 respectively
+            ["r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq -", (3, 4), True, [(5, 5)]],
+            ["r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq -", (1, 5), True, [(4, 2)]],
+            # Pawns only attack diagonally forwards
+            ["4k3/8/8/3p4/4P3/8/8/4K3 w - -", (3, 3), True, [(4, 4)]],
+            ["4k3/8/8/3p4/4P3/8/8/4K3 w - -", (4, 4), False, [(3, 3)]],
+            ["4k3/8/8/3p4/4P3/8/8/4K3 w - -", (3, 4), True, []],
+            # Sliding pieces are blocked by any piece in between
+            ["4k3/8/8/8/r2q4/8/3P4/3QK3 b - -", (4, 2), False, [(4, 0), (4, 3)]],
+            ["4k3/8/8/8/r2q4/8/3P4/3QK3 b - -", (4, 7), False, [(4, 3)]],
+            ["4k3/8/8/8/r2q4/8/3P4/3QK3 b - -", (5, 3), True, []],
+            ["4k3/8/8/8/r2q4/8/3P4/3QK3 b - -", (6, 4), True, [(7, 3), (7, 4)]],
+        ]
+    )
+    def test_attackers_to(self, fen_str, square, by_white, attackers):
+        self.state.load_fen_string(fen_str + " 0 1")
+        bitboard = self.state.attackers_to(8 * square[0] + square[1], by_white)
+        self.assertEqual(sorted(divmod(i, 8) for i in range(64) if bitboard >> i & 1), attackers)
+
+    @parameterized.expand(
+        [
+            ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -", True, []],
+            # The knight on d2 is pinned by the bishop on b4, the pawn on f2 is not pinned
+            ["4k3/8/8/8/1b6/8/3N1P2/4K2r w - -", True, [(6, 3)]],
+            # Two pieces in between do not pin either of them
+            ["4k3/8/8/8/1b6/2P5/3N4/4K3 w - -", True, []],
+            # Only the pieces of the given color can be pinned
+            ["4r3/8/8/8/8/8/4n3/4K3 w - -", True, []],
+            ["4k3/4n3/8/8/8/8/8/Q3R2K b - -", False, [(1, 4)]],
+        ]
+    )
+    def test_pinned(self, fen_str, is_white, pinned):
+        self.state.load_fen_string(fen_str + " 0 1")
+        bitboard = self.state.pinned(is_white)
+        self.assertEqual(sorted(divmod(i, 8) for i in range(64) if bitboard >> i & 1), pinned)
+
+    @parameterized.expand(
+        [
+            ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -", True, []],
+            ["4k3/8/8/8/1b6/8/8/4K2r w - -", True, [(4, 1), (7, 7)]],
+            ["4k3/8/3N4/8/8/8/8/4K3 b - -", False, [(2, 3)]],
+        ]
+    )
+    def test_checkers(self, fen_str, is_white, checkers):
+        self.state.load_fen_string(fen_str + " 0 1")
+        bitboard = self.state.checkers(is_white)
+        self.assertEqual(sorted(divmod(i, 8) for i in range(64) if bitboard >> i & 1), checkers)
+
+    @parameterized.expand(
+        [
+            ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -"],
+            ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -"],
+            ["8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -"],
+            ["r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq -"],
+        ]
+    )
+    def test_attacked_squares(self, fen_str):
+        self.state.load_fen_string(fen_str + " 0 1")
+        for by_white in (True, False):
+            attacked = sum(
+                1 << index for index in range(64) if self.state.attackers_to(index, by_white)
+            )
+            self.assertEqual(self.state.attacked_squares(by_white), attacked)
+            self.assertEqual(
+                sum(1 << index for index in range(64) if self.state.is_attacked(index, by_white)),
+                attacked,
+            )
+
+    def test_placement_hash(self):
+        fen_str = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        initial_hash = self.state._placement_hash
+        self.state.load_fen_string(fen_str)
+        self.assertNotEqual(self.state._placement_hash, initial_hash)
+        expected_hash = GameState.from_fen_string(fen_str)._placement_hash
+        self.assertEqual(self.state._placement_hash, expected_hash)
+
+        # Moving a piece away and back restores the hash
+        knight = self.state.get_piece_on(3, 4)
+        self.state.place_piece_on(3, 4, None)
+        self.state.place_piece_on(2, 2, knight)
+        self.assertNotEqual(self.state._placement_hash, expected_hash)
+        self.state.place_piece_on(2, 2, None)
+        self.state.place_piece_on(3, 4, knight)
+        self.assertEqual(self.state._placement_hash, expected_hash)
+
+    @parameterized.expand(
+        [
+            ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"],
+            ["8/8/8/2k5/2pP4/8/B7/4K3 b - d3 0 3"],
+            ["n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1"],
+        ]
+    )
+    def test_push_pop(self, fen_str):
+        game = ChessGame()
+        game.state.load_fen_string(fen_str)
+        self.state = game.state
+        expected_hash = self.state._placement_hash
+        for move in game.get_all_legal_moves():
+            self.state.push(move)
+            self.assert_bitboards_match_pieces()
+            self.assertNotEqual(self.state.to_fen_string(), fen_str)
+            self.assertIs(self.state.pop(), move)
+            self.assertEqual(self.state.to_fen_string(), fen_str)
+            self.assertEqual(self.state._placement_hash, expected_hash)
+
+    def test_push_castling(self):
+        game = ChessGame()
+        game.state.load_fen_string("r3k2r/8/8/8/4Pp2/8/8/R3K2R b KQkq e3 0 1")
+        (move,) = [m for m in game.get_possible_moves_from((0, 4)) if m.target == (0, 2)]
+        game.state.push(move)
+        # Castling clears the en passant target and advances the move counters like other moves
+        self.assertEqual(game.state.to_fen_string(), "2kr3r/8/8/8/4Pp2/8/8/R3K2R w KQ - 1 2")
+        game.state.pop()
+        self.assertEqual(game.state.to_fen_string(), "r3k2r/8/8/8/4Pp2/8/8/R3K2R b KQkq e3 0 1")
+
+    def test_load_fen_string_clears_history(self):
+        game = ChessGame()
+        game.state.push(game.get_all_legal_moves()[0])
+        game.state.load_fen_string("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(game.state._history, [])
+
+    @parameterized.expand(
+        [
+            ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 3, 97862],
+            ["8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 3, 2812],
+            # Rooks captured on their starting squares revoke the opponent's castling rights
+            ["r3k2r/8/8/3B4/4b3/8/8/R3K2R w KQkq - 0 1", 3, 33867],
+            ["r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3, 9467],
+            ["rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 2, 1486],
+        ]
+    )
+    def test_push_pop_perft(self, fen_str, depth, n_nodes):
+        game = ChessGame()
+        game.state.load_fen_string(fen_str)
+
+        def perft(depth):
+            # Count the positions reached after depth moves, making and taking back every move
+            game._clear_move_cache()
+            moves = [
+                move
+                for index in iter_bits(game.state.get_color_bitboard(game.state.is_white_active))
+                for move in game.get_possible_moves_from(
+                    SQUARES[index], include_promotion_options=True
+                )
+            ]
+            if depth == 1:
+                return len(moves)
+            n = 0
+            for move in moves:
+                game.state.push(move)
+                n += perft(depth - 1)
+                game.state.pop()
+            return n
+
+        self.assertEqual(perft(depth), n_nodes)
+        self.assertEqual(game.state.to_fen_string(), fen_str)
+
+    def test_zobrist_hash(self):
+        fen_str = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        self.state.load_fen_string(fen_str)
+        expected_hash = self.state.zobrist_hash
+        self.assertEqual(hash(self.state), expected_hash)
+        # The move counters are not part of the position
+        self.assertEqual(GameState.from_fen_string(fen_str[:-3] + "5 9").zobrist_hash, expected_hash)
+        for other_fen_str in (
+            fen_str.replace(" w ", " b "),
+            fen_str.replace("KQkq", "KQk"),
+            fen_str.replace(" - ", " e3 "),
+        ):
+            self.assertNotEqual(GameState.from_fen_string(other_fen_str).zobrist_hash, expected_hash)